@@ -3,35 +3,77 @@ import base64
 import streamlit as st
 import os
 import io
+import sys
 from PIL import Image 
 import pdf2image
 import google.generativeai as genai
-import re  # Import regex for extracting numbers
+
+# Shared helpers (scoring client, result cache) live next to the main app
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ML + Rule Based NER Model"))
+from scoring_client import ScoringClient, ScoringError, SCORE_FIELDS
+from instrumentation import warning, log_event
 
 # Load API Key
 load_dotenv()
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
-# Function to get Gemini response
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+@st.cache_resource
+def load_scoring_client():
+    return ScoringClient(GEMINI_MODEL_NAME)
+
+# Function to get validated Gemini scores (reused for the same resume image and job description)
 def get_gemini_response(input_prompt, pdf_content, job_description):
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    response = model.generate_content([input_prompt, pdf_content[0], job_description])
-    return response.text
+    return load_scoring_client().score(input_prompt, [pdf_content[0], job_description])
+
+# Rendering settings for the resume image sent to Gemini
+POPPLER_PATH = os.getenv("POPPLER_PATH") or None  # e.g. C:\poppler-24.08.0\Library\bin on Windows
+RENDER_PAGES = int(os.getenv("ATS_RENDER_PAGES", "1"))  # pages sent to the model
+RENDER_DPI = int(os.getenv("ATS_RENDER_DPI", "120"))
+JPEG_QUALITY = int(os.getenv("ATS_JPEG_QUALITY", "85"))
+MAX_IMAGE_PIXELS = int(os.getenv("ATS_MAX_IMAGE_PIXELS", str(2_000_000)))
+
+def tile_pages(images):
+    """
+    Stacks page images vertically into one image.
+    """
+    width = max(image.width for image in images)
+    tiled = Image.new("RGB", (width, sum(image.height for image in images)), "white")
+    top = 0
+    for image in images:
+        tiled.paste(image, (0, top))
+        top += image.height
+    return tiled
+
+# Rendered and encoded once per uploaded file and settings
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_pdf_image(pdf_bytes, pages=1, dpi=120, jpeg_quality=85, max_pixels=2_000_000):
+    """
+    Renders the first `pages` pages of the PDF at `dpi`, tiles them into a
+    single image, shrinks it to at most `max_pixels` pixels and returns it
+    as a base64-encoded JPEG.
+    """
+    images = pdf2image.convert_from_bytes(
+        pdf_bytes, dpi=dpi, first_page=1, last_page=pages, poppler_path=POPPLER_PATH
+    )
+    image = tile_pages(images) if len(images) > 1 else images[0].convert("RGB")
+
+    if image.width * image.height > max_pixels:
+        scale = (max_pixels / (image.width * image.height)) ** 0.5
+        image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.LANCZOS)
+
+    img_byte_arr = io.BytesIO()
+    image.save(img_byte_arr, format='JPEG', quality=jpeg_quality, optimize=True)
+    return base64.b64encode(img_byte_arr.getvalue()).decode()
 
 # Function to process uploaded PDF
-def input_pdf_setup(uploaded_file):
+def input_pdf_setup(uploaded_file, pages=RENDER_PAGES):
     if uploaded_file is not None:
-        images = pdf2image.convert_from_bytes(uploaded_file.read(), poppler_path=r"C:\poppler-24.08.0\Library\bin")
-        first_page = images[0]
-
-        img_byte_arr = io.BytesIO()
-        first_page.save(img_byte_arr, format='JPEG')
-        img_byte_arr = img_byte_arr.getvalue()
-
         pdf_parts = [
             {
                 "mime_type": "image/jpeg",
-                "data": base64.b64encode(img_byte_arr).decode()
+                "data": render_pdf_image(uploaded_file.getvalue(), pages, RENDER_DPI, JPEG_QUALITY, MAX_IMAGE_PIXELS)
             }
         ]
         return pdf_parts
@@ -61,35 +103,24 @@ You are an experienced ATS Scanner and HR Manager. Evaluate the resume based on
 5 Experience Relevance Score: Determines how relevant the experience is.  
 6 Customization Score: Measures how well the resume is tailored to the job.  
 
-**Output Format (Only return numbers, no descriptions):**  
-ATS SCORE: XX%  
-Readability Score: XX%  
-Grammar & Spelling Score: XX%  
-Keyword Optimization Score: XX%  
-Experience Relevance Score: XX%  
-Customization Score: XX%
-"""
+Use the JSON keys {} for these scores, in this order.
+""".format(", ".join(SCORE_FIELDS))
 
 if submit:
     if uploaded_file is not None:
         pdf_content = input_pdf_setup(uploaded_file)
-        response = get_gemini_response(input_prompt, pdf_content, input_text)
-        
-        
-
-        # Extract numbers using regex (handles both "XX%" and "XX")
-        scores = re.findall(r"(\d+)%?", response)
+        try:
+            scores = get_gemini_response(input_prompt, pdf_content, input_text)
+        except ScoringError as e:
+            scores = None
+            warning(f"⚠️ Error extracting scores: {e}", error=str(e))
 
-        if len(scores) == 6:
-            ats_score, readability_score, grammar_score, keyword_score, experience_score, customization_score = scores
+        if scores is not None:
+            ats_score, readability_score, grammar_score, keyword_score, experience_score, customization_score = (
+                scores[field] for field in SCORE_FIELDS
+            )
 
-            # Print extracted scores in terminal
-            print(f"{ats_score}")
-            print(f"{readability_score}")
-            print(f"{grammar_score}")
-            print(f"{keyword_score}")
-            print(f"{experience_score}")
-            print(f"{customization_score}")
+            log_event("ats_scores", **scores)
 
             # Display in Streamlit
             st.subheader("📊 ATS & Resume Analysis Scores:")
@@ -101,7 +132,6 @@ if submit:
             st.write(f"📌 **Customization Score**: {customization_score}%")
 
         else:
-            print("⚠️ Error extracting scores: Insufficient data")
             st.error("⚠️ Could not extract all 6 scores. Check API response format.")
 
     else:
@@ -1,11 +1,12 @@
 import streamlit as st
-import pdfplumber
-import docx2txt
-import re
 import os
-from recommendation import get_recommendations
+from recommendation import get_recommendations, get_role_index
 import ner_module
-import cleaning_module
+from warmup import WarmUp
+from skill_normaliser import clean_skills, get_skill_normaliser
+import text_extraction
+from scoring_client import ScoringClient, RESUME_PROMPT
+from stages import run_stages, StageTimeout
 import pandas as pd
 from dotenv import load_dotenv
 import google.generativeai as genai
@@ -14,6 +15,9 @@ import google.generativeai as genai
 load_dotenv()
 genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
 
+# Only the first pages of a resume are read; set MAX_RESUME_PAGES=0 to read all
+MAX_RESUME_PAGES = int(os.getenv("MAX_RESUME_PAGES", "10")) or None
+
 # Preload static data
 @st.cache_data
 def load_valid_skills(filepath="skill_set.txt"):
@@ -31,10 +35,32 @@ def load_skills_data():
         st.error(f"Failed to load data: {e}")
         return pd.DataFrame()
 
-# Initialize Gemini model once
+# Initialize the Gemini scoring client once
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
 @st.cache_resource
-def load_gemini_model():
-    return genai.GenerativeModel('gemini-1.5-flash')
+def load_scoring_client():
+    return ScoringClient(GEMINI_MODEL_NAME)
+
+# Models and indexes load in background threads, so the page renders at once
+# and the first extraction only waits for whatever hasn't finished yet
+@st.cache_resource
+def start_warm_up():
+    return WarmUp().start({**ner_module.warm_up_tasks(), "role index": get_role_index,
+                           "skill normaliser": get_skill_normaliser})
+
+warm_up = start_warm_up()
+# What the Extract button needs; the role index is only used later on
+EXTRACTION_TASKS = (*ner_module.warm_up_tasks(), "skill normaliser")
+
+@st.fragment(run_every=2)
+def show_warm_up_status():
+    pending = warm_up.pending()
+    if pending:
+        st.caption("⏳ Loading " + ", ".join(pending) + "...")
+    for name, task in warm_up.status().items():
+        if task["state"] == "failed":
+            st.caption(f"⚠️ Could not preload {name}: {task['error']}")
 
 # Session state initialization
 if 'resume_data' not in st.session_state:
@@ -47,42 +73,33 @@ if 'resume_data' not in st.session_state:
     }
 
 # ATS scoring prompt
-ats_prompt = """
-Analyze this resume and job description to provide these 6 scores:
-1. ATS Score: Match between resume and job description (0-100%)
-2. Readability: Resume clarity and structure (0-100%)
-3. Grammar: Spelling and grammar correctness (0-100%)
-4. Keywords: Industry-specific keyword usage (0-100%)
-5. Experience: Relevance of experience (0-100%)
-6. Customization: Tailoring to this specific job (0-100%)
-
-Format response ONLY as comma-separated numbers:
-ATS,Readability,Grammar,Keywords,Experience,Customization
-"""
+ats_prompt = RESUME_PROMPT
 
 st.title("Dynamic Curriculum Design")
 
 # File upload section
 with st.sidebar:
     uploaded_file = st.file_uploader("📄 Upload Resume", type=["pdf", "docx", "txt"])
+    if not warm_up.ready():
+        show_warm_up_status()
     if uploaded_file:
         # Process resume text once
         if not st.session_state.resume_data['text']:
-            if uploaded_file.type == "application/pdf":
-                with pdfplumber.open(uploaded_file) as pdf:
-                    st.session_state.resume_data['text'] = "\n".join(
-                        [page.extract_text() for page in pdf.pages]
-                    )
-            elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                st.session_state.resume_data['text'] = docx2txt.process(uploaded_file)
-            else:
-                st.session_state.resume_data['text'] = uploaded_file.getvalue().decode("utf-8")
+            st.session_state.resume_data['text'] = text_extraction.extract_text(
+                uploaded_file,
+                filename=uploaded_file.name,
+                mime_type=uploaded_file.type,
+                max_pages=MAX_RESUME_PAGES
+            )
 
         # Extract information once
         if st.button("🔍 Extract Resume Information") and not st.session_state.resume_data['extracted']:
+            if not warm_up.ready(*EXTRACTION_TASKS):
+                with st.spinner("Loading models..."):
+                    warm_up.wait(*EXTRACTION_TASKS)
             result = ner_module.ner_ml_rule(uploaded_file.name, st.session_state.resume_data['text'])
             raw_skills = result[7]
-            cleaned_skills = cleaning_module.clean_text_with_groq(", ".join(raw_skills)).split(",")
+            cleaned_skills = clean_skills(", ".join(raw_skills)).split(",")
             
             st.session_state.resume_data['extracted'] = {
                 "Skills (Cleaned)": ", ".join(cleaned_skills),
@@ -90,10 +107,38 @@ with st.sidebar:
             }
             st.success("Information extracted!")
 
+# Seconds each analysis stage may take before its result is given up
+STAGE_TIMEOUTS = {"recommendations": 60, "ats_scores": 45}
+
+def get_ats_scores(client, resume_text, job_desc):
+    """Gemini ATS scores by display label; raises ScoringError on an invalid reply"""
+    return client.labelled(client.score(ats_prompt, [resume_text, job_desc]))
+
+def render_ats_scores(ats_scores):
+    st.subheader("📊 ATS Evaluation")
+    for metric, score in ats_scores.items():
+        st.metric(label=metric, value=score)
+
+def render_recommendations(recommendations):
+    st.subheader("📚 Recommended Learning")
+    missing_skills, recs = recommendations
+    for skill in missing_skills:
+        with st.expander(f"🎯 {skill}", expanded=True):
+            if recs.get(skill):
+                for title, url in recs[skill]:
+                    st.markdown(f"[{title}]({url})")
+            else:
+                st.info("No courses found for this skill")
+
 # Main content area
 if st.session_state.resume_data['extracted']:
     col1, col2 = st.columns([3, 2])
     
+    # Filled as soon as each analysis stage finishes
+    with col2:
+        ats_area = st.empty()
+        recommendations_area = st.empty()
+    
     with col1:
         # Display extracted cleaned skills before job description
         st.subheader("Extracted Skills")
@@ -110,58 +155,44 @@ if st.session_state.resume_data['extracted']:
         if st.button("🚀 Analyze Compatibility", key="analyze_comp"):
             if st.session_state.resume_data['job_desc'].strip():
                 with st.spinner("Analyzing resume and generating recommendations..."):
-                    # Get recommendations
-                    missing_skills, recs = get_recommendations(
-                        st.session_state.resume_data['job_desc'],
-                        st.session_state.resume_data['extracted']['Skills (Cleaned)']
-                    )
+                    resume_text = st.session_state.resume_data['text']
+                    job_desc = st.session_state.resume_data['job_desc']
+                    skills = st.session_state.resume_data['extracted']['Skills (Cleaned)']
+                    client = load_scoring_client()
+                    st.session_state.resume_data['ats_scores'] = None
+                    st.session_state.resume_data['recommendations'] = None
                     
-                    # Get ATS scores using Gemini
-                    model = load_gemini_model()
-                    response = model.generate_content([
-                        ats_prompt,
-                        st.session_state.resume_data['text'],
-                        st.session_state.resume_data['job_desc']
-                    ])
-                    
-                    # Process scores
-                    scores = re.findall(r"\d+", response.text)
-                    if len(scores) == 6:
-                        st.session_state.resume_data['ats_scores'] = {
-                            "ATS Score": f"{scores[0]}%",
-                            "Readability": f"{scores[1]}%",
-                            "Grammar": f"{scores[2]}%",
-                            "Keywords": f"{scores[3]}%",
-                            "Experience": f"{scores[4]}%",
-                            "Customization": f"{scores[5]}%"
-                        }
-                    else:
-                        st.error("Failed to retrieve ATS scores")
-                    
-                    # Store recommendations and trigger a rerun
-                    st.session_state.resume_data['recommendations'] = (missing_skills, recs)
-                    st.rerun()
+                    # Recommendations (Groq + YouTube) and Gemini scoring run concurrently
+                    stages = {
+                        "recommendations": lambda: get_recommendations(job_desc, skills),
+                        "ats_scores": lambda: get_ats_scores(client, resume_text, job_desc),
+                    }
+                    for stage, result, error in run_stages(stages, timeouts=STAGE_TIMEOUTS):
+                        if isinstance(error, StageTimeout):
+                            st.warning(f"{stage.replace('_', ' ').capitalize()} timed out, please try again.")
+                        elif stage == "ats_scores":
+                            st.session_state.resume_data['ats_scores'] = result
+                            if result:
+                                with ats_area.container():
+                                    render_ats_scores(result)
+                            else:
+                                st.error(f"Failed to retrieve ATS scores{': ' + str(error) if error else ''}")
+                        elif error:
+                            st.error(f"Failed to generate recommendations: {error}")
+                        else:
+                            st.session_state.resume_data['recommendations'] = result
+                            with recommendations_area.container():
+                                render_recommendations(result)
             else:
                 st.warning("Please enter a job description before analyzing.")
     
-    with col2:
-        # Display ATS scores
-        if st.session_state.resume_data['ats_scores']:
-            st.subheader("📊 ATS Evaluation")
-            for metric, score in st.session_state.resume_data['ats_scores'].items():
-                st.metric(label=metric, value=score)
-        
-        # Display Skill Recommendations
-        if st.session_state.resume_data['recommendations']:
-            st.subheader("📚 Recommended Learning")
-            missing_skills, recs = st.session_state.resume_data['recommendations']
-            for skill in missing_skills:
-                with st.expander(f"🎯 {skill}", expanded=True):
-                    if recs.get(skill):
-                        for title, url in recs[skill]:
-                            st.markdown(f"[{title}]({url})")
-                    else:
-                        st.info("No courses found for this skill")
+    # Results of a previous analysis
+    if st.session_state.resume_data['ats_scores']:
+        with ats_area.container():
+            render_ats_scores(st.session_state.resume_data['ats_scores'])
+    if st.session_state.resume_data['recommendations']:
+        with recommendations_area.container():
+            render_recommendations(st.session_state.resume_data['recommendations'])
 
 # Display raw resume text
 # if st.session_state.resume_data['text']:
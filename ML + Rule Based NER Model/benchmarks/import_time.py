@@ -0,0 +1,88 @@
+# benchmarks/import_time.py
+"""
+Measures the cold import cost of each app module, each in a fresh
+interpreter, and writes the results as JSON:
+
+    python benchmarks/import_time.py --repeat 5 --output import_time.json
+
+A module's time includes everything it imports that wasn't loaded yet, so
+it is what a cold start pays for that import. The slowest transitive
+imports (from python -X importtime) are listed alongside.
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ("ner_module", "recommendation", "cleaning_module", "scoring_client", "webscrap",
+           "text_extraction", "course_catalogue", "role_index", "pipeline")
+
+TIMER = "import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)"
+
+def time_import(module):
+    """
+    Returns the seconds `import module` takes in a fresh interpreter.
+    """
+    completed = subprocess.run([sys.executable, "-c", TIMER.format(module)], cwd=APP_DIR,
+                               capture_output=True, text=True, check=True)
+    return float(completed.stdout.strip().splitlines()[-1])
+
+def import_times(code):
+    """
+    Returns [(name, cumulative_seconds)] from python -X importtime -c code.
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=APP_DIR,
+                               capture_output=True, text=True, check=True)
+    entries = []
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        entries.append((parts[2].strip(), int(parts[1]) / 1e6))
+    return entries
+
+def slowest_imports(module, top=5, startup=()):
+    """
+    Returns the `top` (name, cumulative_seconds) imports of the module,
+    leaving out those the interpreter already makes at startup.
+    """
+    entries = [entry for entry in import_times("import " + module) if entry[0] not in startup]
+    return sorted(entries, key=lambda entry: -entry[1])[:top]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time of each module")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="import_time.json")
+    args = parser.parse_args(argv)
+
+    startup = {name for name, _ in import_times("pass")}
+    results = {}
+    for module in args.modules:
+        try:
+            samples = [time_import(module) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr.strip().splitlines() or ["import failed"])[-1]
+            results[module] = {"error": error}
+            print(f"{module:<20} failed: {error}")
+            continue
+        results[module] = {
+            "median_seconds": statistics.median(samples),
+            "min_seconds": min(samples),
+            "samples": samples,
+            "slowest_imports": slowest_imports(module, startup=startup),
+        }
+        print(f"{module:<20} {results[module]['median_seconds']:.3f} s")
+
+    report = {"python": platform.python_version(), "repeat": args.repeat, "modules": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
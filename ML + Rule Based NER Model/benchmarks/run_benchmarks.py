@@ -0,0 +1,220 @@
+# benchmarks/run_benchmarks.py
+"""
+Latency (p50/p95), throughput and peak RSS of the extraction and
+recommendation functions over a seeded synthetic corpus:
+
+    python benchmarks/run_benchmarks.py --resumes 50 --output bench.json
+    python benchmarks/run_benchmarks.py --only extract_email get_sections --baseline bench.json
+
+Each function runs in its own fresh process, so its peak RSS isn't mixed
+with the others'. The first --warm-up resumes load models and indexes and
+are not timed, and the result cache is memory-only and cleared before
+timing. The Groq skill cleaning and YouTube lookups are replaced by local
+stubs, and recommendations use a synthetic role catalogue, so numbers only
+depend on the code and the machine.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+sys.path[:0] = [APP_DIR, BENCH_DIR]
+
+from synthetic_corpus import generate_corpus, write_role_catalogue
+
+TARGETS = ("extract_names", "extract_mobile_number", "extract_email", "extract_degree", "extract_grad_years",
+           "extract_locations", "extract_organization", "extract_company", "extract_designations",
+           "get_skills_and_scores", "get_sections", "extract_resume",
+           "recommend_missing_skills", "get_recommendations")
+
+class StubCatalogue:
+    """Stands in for the YouTube course catalogue: one fixed course per skill."""
+
+    def lookup_many(self, skills):
+        return {skill: [(f"{skill} full course", "https://example.invalid/" + "-".join(skill.lower().split()))]
+                for skill in skills}
+
+def install_stubs(catalogue_path, index_dir):
+    """
+    Replaces the network-bound parts of the recommendation pipeline with
+    local stubs and points it at the synthetic role catalogue.
+    """
+    import recommendation
+    import skill_normaliser
+    from cleaning_module import normalise_skills_locally
+    # Skills the local normaliser is unsure of would go to Groq
+    skill_normaliser.clean_text_with_groq = lambda text, **kwargs: normalise_skills_locally(text)
+    catalogue = StubCatalogue()
+    recommendation.get_course_catalogue = lambda: catalogue
+    recommendation.CATALOGUE_PATH = catalogue_path
+    recommendation.ROLE_INDEX_DIR = index_dir
+    recommendation.SKILL_VECTORS_DIR = index_dir + "_vectors"
+    recommendation.get_role_index.cache_clear()
+    recommendation.get_skill_vectors.cache_clear()
+
+def target_functions():
+    """
+    Returns {name: func(resume, job_description)} for every benchmark target.
+    """
+    import ner_module
+    import recommendation
+
+    def skills_of(resume):
+        return ", ".join(resume["skills"])
+
+    return {
+        "extract_names": lambda resume, jd: ner_module.extract_names(resume["text"]),
+        "extract_mobile_number": lambda resume, jd: ner_module.extract_mobile_number(resume["text"]),
+        "extract_email": lambda resume, jd: ner_module.extract_email(resume["text"]),
+        "extract_degree": lambda resume, jd: ner_module.extract_degree(resume["text"]),
+        "extract_grad_years": lambda resume, jd: ner_module.extract_grad_years(resume["text"]),
+        "extract_locations": lambda resume, jd: ner_module.extract_locations(resume["text"]),
+        "extract_organization": lambda resume, jd: ner_module.extract_organization(resume["text"]),
+        "extract_company": lambda resume, jd: ner_module.extract_company(resume["text"]),
+        "extract_designations": lambda resume, jd: ner_module.extract_designations(resume["text"]),
+        "get_skills_and_scores": lambda resume, jd: ner_module.get_skills_and_scores(
+            ner_module.get_skills_section(resume["text"])),
+        "get_sections": lambda resume, jd: ner_module.get_sections(resume["text"]),
+        "extract_resume": lambda resume, jd: ner_module.extract_resume(resume["name"], resume["text"], use_cache=False),
+        "recommend_missing_skills": lambda resume, jd: recommendation.recommend_missing_skills(jd, skills_of(resume)),
+        "get_recommendations": lambda resume, jd: recommendation.get_recommendations(jd, skills_of(resume)),
+    }
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB, or None where unsupported.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile (q in 0-100) of a non-empty list.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+def run_target(name, n_resumes, seed, warm_up, catalogue_path, index_dir):
+    """
+    Times one target over the corpus in the current (fresh) process and
+    returns its summary.
+    """
+    os.chdir(APP_DIR)
+    # Memory-only result cache, so runs don't read each other's results
+    os.environ["RESULT_CACHE_PATH"] = ""
+    install_stubs(catalogue_path, index_dir)
+    from result_cache import get_cache
+    func = target_functions()[name]
+
+    resumes, job_descriptions = generate_corpus(n_resumes + warm_up, seed)
+    for i, resume in enumerate(resumes[:warm_up]):
+        func(resume, job_descriptions[i % len(job_descriptions)])
+    get_cache().clear()
+
+    rss_before = peak_rss_mb()
+    latencies = []
+    start = time.perf_counter()
+    for i, resume in enumerate(resumes[warm_up:]):
+        call_start = time.perf_counter()
+        func(resume, job_descriptions[i % len(job_descriptions)])
+        latencies.append(time.perf_counter() - call_start)
+    total = time.perf_counter() - start
+    rss_after = peak_rss_mb()
+
+    return {
+        "calls": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "mean_ms": total / len(latencies) * 1000,
+        "resumes_per_second": len(latencies) / total if total else None,
+        "peak_rss_mb": rss_after,
+        "peak_rss_growth_mb": None if rss_before is None else rss_after - rss_before,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=APP_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path):
+    """
+    Prints each target's p50 and p95 change against a previous run's JSON.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\nChange against {baseline_path}:")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if "error" in result or not before or "error" in before:
+            continue
+        changes = ["{} {:+.1f}%".format(key, (result[key] / before[key] - 1) * 100)
+                   for key in ("p50_ms", "p95_ms") if before[key]]
+        print(f"  {name:<26} " + "  ".join(changes))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the resume pipeline functions")
+    parser.add_argument("--resumes", type=int, default=50, help="timed resumes per function")
+    parser.add_argument("--warm-up", type=int, default=3, help="untimed resumes run first")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", choices=TARGETS, help="benchmark just these functions")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        catalogue_path = write_role_catalogue(os.path.join(tmp, "roles.csv"), seed=args.seed)
+        index_dir = os.path.join(tmp, "role_index")
+        for name in args.only or TARGETS:
+            # A fresh process per target keeps peak RSS and caches separate
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                try:
+                    results[name] = executor.submit(run_target, name, args.resumes, args.seed, args.warm_up,
+                                                    catalogue_path, index_dir).result()
+                except Exception as e:
+                    results[name] = {"error": f"{type(e).__name__}: {e}"}
+                    print(f"{name:<26} failed: {results[name]['error']}")
+                    continue
+            result = results[name]
+            rss = "" if result["peak_rss_mb"] is None else f"  peak RSS {result['peak_rss_mb']:.0f} MB"
+            print(f"{name:<26} p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+                  f"{result['resumes_per_second']:8.1f} resumes/s{rss}")
+
+    report = {
+        "meta": {
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "resumes": args.resumes,
+            "warm_up": args.warm_up,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+if __name__ == '__main__':
+    main()
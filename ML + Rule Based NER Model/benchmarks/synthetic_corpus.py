@@ -0,0 +1,130 @@
+# benchmarks/synthetic_corpus.py
+"""
+Seeded synthetic resumes, job descriptions and a role catalogue, built from
+skill_set.txt, company.txt and job-titles.txt, so benchmark runs on any
+machine see exactly the same inputs.
+
+    python benchmarks/synthetic_corpus.py --resumes 100 --seed 0 --output corpus.jsonl
+"""
+import os
+import csv
+import json
+import random
+import argparse
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_NAMES = ["Aarav", "Priya", "John", "Maria", "Wei", "Fatima", "Carlos", "Anna", "Rahul", "Emily",
+               "Kenji", "Sara", "David", "Aisha", "Lucas", "Nina"]
+LAST_NAMES = ["Sharma", "Patel", "Smith", "Garcia", "Chen", "Khan", "Lopez", "Muller", "Das", "Brown",
+              "Tanaka", "Rossi", "Cohen", "Okafor", "Silva", "Novak"]
+CITIES = ["Bengaluru", "Hyderabad", "Pune", "Mumbai", "New York", "London", "Berlin", "Toronto", "Singapore"]
+UNIVERSITIES = ["Indian Institute of Technology Bombay", "National Institute of Technology Rourkela",
+                "Stanford University", "University of Toronto", "Delhi University", "KIIT University"]
+DEGREES = ["Bachelor of Technology", "Bachelor of Science in Computer Science", "Master of Science",
+           "Master of Business Administration", "Bachelor of Engineering"]
+VERBS = ["Built", "Designed", "Maintained", "Led", "Optimised", "Migrated", "Automated", "Delivered"]
+OBJECTS = ["a data pipeline", "REST services", "the reporting platform", "CI/CD workflows",
+           "a recommendation engine", "internal dashboards", "the billing system", "ML models"]
+
+def read_lines(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def load_vocabulary(app_dir=APP_DIR):
+    """
+    Returns the skill, company and job title lists the corpus is drawn from.
+    """
+    return {
+        "skills": read_lines(os.path.join(app_dir, "skill_set.txt")),
+        "companies": read_lines(os.path.join(app_dir, "company.txt")),
+        "titles": read_lines(os.path.join(app_dir, "job-titles.txt")),
+    }
+
+def make_resume(rng, vocabulary, index):
+    """
+    Returns one synthetic resume: {"name", "text", "skills", "companies", "titles"}.
+    The text has the section headers ner_module.SECTION_PATTERNS recognises.
+    """
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(vocabulary["skills"], rng.randint(6, 18))
+    jobs = [(rng.choice(vocabulary["titles"]).title(), rng.choice(vocabulary["companies"]))
+            for _ in range(rng.randint(1, 4))]
+    start_year = rng.randint(2005, 2018)
+
+    lines = [name, rng.choice(jobs)[0], f"{rng.choice(CITIES)}, India",
+             f"Phone: +91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)}",
+             f"Email: {name.lower().replace(' ', '.')}{index}@example.com", "",
+             "Professional Summary",
+             f"{rng.choice(jobs)[0]} with {rng.randint(1, 15)} years of experience in "
+             f"{', '.join(skills[:3])}.", "",
+             "Work Experience"]
+    year = start_year
+    for title, company in jobs:
+        end = year + rng.randint(1, 4)
+        lines.append(f"{title}, {company} ({year} - {end})")
+        for _ in range(rng.randint(2, 4)):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}.")
+        year = end
+    lines += ["", "Education",
+              f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}, {start_year - rng.randint(0, 2)}", "",
+              "Technical Skills", ", ".join(skills), ""]
+    return {
+        "name": f"resume_{index:05d}.txt",
+        "text": "\n".join(lines),
+        "skills": skills,
+        "companies": [company for _, company in jobs],
+        "titles": [title for title, _ in jobs],
+    }
+
+def make_job_description(rng, vocabulary):
+    """
+    Returns a synthetic job description text.
+    """
+    title = rng.choice(vocabulary["titles"]).title()
+    skills = rng.sample(vocabulary["skills"], rng.randint(5, 12))
+    return (f"We are hiring a {title} at {rng.choice(vocabulary['companies'])}. "
+            f"Required skills: {', '.join(skills[:len(skills) // 2])}. "
+            f"Nice to have: {', '.join(skills[len(skills) // 2:])}.")
+
+def generate_corpus(n_resumes, seed=0, n_job_descriptions=None, vocabulary=None):
+    """
+    Returns (resumes, job_descriptions), identical for the same seed and sizes.
+    """
+    rng = random.Random(seed)
+    vocabulary = vocabulary or load_vocabulary()
+    resumes = [make_resume(rng, vocabulary, i) for i in range(n_resumes)]
+    job_descriptions = [make_job_description(rng, vocabulary)
+                        for _ in range(n_job_descriptions or max(1, n_resumes // 5))]
+    return resumes, job_descriptions
+
+def write_role_catalogue(path, n_roles=200, seed=0, vocabulary=None):
+    """
+    Writes a synthetic role catalogue CSV ("role", "skills") in the layout
+    of skill_set.csv, for benchmarking recommendations without the real one.
+    """
+    rng = random.Random(seed)
+    vocabulary = vocabulary or load_vocabulary()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["role", "skills"])
+        for _ in range(n_roles):
+            writer.writerow([rng.choice(vocabulary["titles"]).title(),
+                             ", ".join(rng.sample(vocabulary["skills"], rng.randint(5, 15)))])
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic resume corpus as JSONL")
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="corpus.jsonl")
+    args = parser.parse_args(argv)
+
+    resumes, _ = generate_corpus(args.resumes, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for resume in resumes:
+            f.write(json.dumps(resume) + "\n")
+    print(f"Wrote {len(resumes)} resumes to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,12 @@
 # clean_module.py
-from groq import Groq
+import os
+import asyncio
+import weakref
+import threading
+from concurrent.futures import Future
+from groq import Groq, AsyncGroq
+from result_cache import get_cache, make_key
+from instrumentation import span, increment, warning
 
 def load_api_key(filepath="api.txt"):
     """
@@ -10,42 +17,213 @@ def load_api_key(filepath="api.txt"):
             api_key = f.read().strip()
         return api_key
     except Exception as e:
-        print(f"Error loading API key: {e}")
+        warning(f"Error loading API key: {e}")
         return None
 
 # Load API key from file
 api_key = load_api_key()
 
-def clean_text_with_groq(text, model="gemma2-9b-it", temperature=1, max_completion_tokens=1024, top_p=1, stream=True, stop=None):
-    client = Groq(api_key=api_key)
-    
+# Point the client at another server (e.g. a local stub for benchmarks)
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
+# Deterministic mode: temperature 0, no streaming, and the local normaliser
+# when the API is unavailable
+DETERMINISTIC = os.getenv("GROQ_DETERMINISTIC", "") == "1"
+
+# Bump when the prompt below changes so cached answers are not reused
+PROMPT_VERSION = "1"
+
+# Long-lived clients, so connections are pooled across calls
+_client = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncGroq
+
+def get_client():
+    """
+    Returns the process-wide Groq client, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Groq(api_key=api_key, base_url=GROQ_BASE_URL)
+    return _client
+
+def get_async_client():
+    """
+    Returns the AsyncGroq client of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncGroq(api_key=api_key, base_url=GROQ_BASE_URL)
+        _async_clients[loop] = client
+    return client
+
+def normalise_skills_locally(text):
+    """
+    Offline stand-in for the LLM: trims each comma-separated item, collapses
+    whitespace and drops empty and case-insensitive duplicate items.
+    """
+    skills = {}
+    for item in text.split(","):
+        skill = " ".join(item.split())
+        if skill and skill.lower() not in skills:
+            skills[skill.lower()] = skill
+    return ", ".join(skills.values())
+
+def _build_messages(text):
     prompt = (
         "Clean the following list of skills by correcting spelling mistakes, "
         "removing duplicates, and filtering out any items that are not valid skills."
         "Return ONLY the cleaned comma-separated list with no additional text.\n\n"
         f"Raw Skills: {text}\n\nCleaned Skills:"
     )
+    return [{"role": "user", "content": prompt}]
+
+def _request_key(text, model, temperature, max_completion_tokens, top_p, stop):
+    settings = "{}|{}|{}|{}|{}".format(PROMPT_VERSION, temperature, max_completion_tokens, top_p, stop)
+    return make_key("groq_clean", text, model=model, prompt_version=settings)
+
+def _can_call_api():
+    return bool(api_key) or GROQ_BASE_URL is not None
+
+# Requests currently running, so identical concurrent calls share one response
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_async_in_flight = weakref.WeakKeyDictionary()  # event loop -> {key: Task}
+
+def _coalesced(key, request):
+    """
+    Runs request() once per key at a time; concurrent callers with the same
+    key wait for the first caller's result instead of sending their own.
+    """
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _in_flight[key] = future
+    if not owner:
+        return future.result()
+    try:
+        result = request()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+
+def clean_text_with_groq(text, model="gemma2-9b-it", temperature=1, max_completion_tokens=1024, top_p=1, stream=True, stop=None, use_cache=True, deterministic=None):
+    """
+    Asks the LLM to clean a comma-separated skill list.
+
+    The pooled client is reused and identical in-flight requests are sent
+    once. With `use_cache`, the answer for the same text, model, prompt
+    version and settings is reused. `deterministic` (default: the
+    GROQ_DETERMINISTIC environment variable) forces temperature 0 without
+    streaming and falls back to normalise_skills_locally when the API is not
+    configured or the request fails.
+    """
+    deterministic = DETERMINISTIC if deterministic is None else deterministic
+    if deterministic:
+        temperature, top_p, stream = 0, 1, False
+        if not _can_call_api():
+            return normalise_skills_locally(text)
     
-    messages = [{"role": "user", "content": prompt}]
+    key = _request_key(text, model, temperature, max_completion_tokens, top_p, stop)
     
-    completion = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=temperature,
-        max_completion_tokens=max_completion_tokens,
-        top_p=top_p,
-        stream=stream,
-        stop=stop,
-    )
+    def request():
+        with span("groq", model=model):
+            completion = get_client().chat.completions.create(
+                model=model,
+                messages=_build_messages(text),
+                temperature=temperature,
+                max_completion_tokens=max_completion_tokens,
+                top_p=top_p,
+                stream=stream,
+                stop=stop,
+            )
+            if stream:
+                return "".join(chunk.choices[0].delta.content or "" for chunk in completion)
+            # content is None when the model returns no text (e.g. refusals)
+            result = (completion.choices[0].message.content or "").strip()
+        if deterministic and not result:
+            raise ValueError("Groq returned an empty completion")
+        return result
     
-    if stream:
-        result = ""
-        for chunk in completion:
-            result += chunk.choices[0].delta.content or ""
-    else:
-        result = completion.choices[0].message["content"].strip()
+    try:
+        if use_cache:
+            return get_cache().get_or_compute(key, lambda: _coalesced(key, request))
+        return _coalesced(key, request)
+    except Exception as e:
+        increment("external_call_failures", service="groq")
+        if not deterministic:
+            raise
+        warning(f"Groq request failed, using the local normaliser: {e}", error=str(e))
+        return normalise_skills_locally(text)
+
+async def clean_text_with_groq_async(text, model="gemma2-9b-it", temperature=1, max_completion_tokens=1024, top_p=1, stream=True, stop=None, use_cache=True, deterministic=None):
+    """
+    asyncio variant of clean_text_with_groq, with the same caching,
+    coalescing (per event loop) and deterministic mode.
+    """
+    deterministic = DETERMINISTIC if deterministic is None else deterministic
+    if deterministic:
+        temperature, top_p, stream = 0, 1, False
+        if not _can_call_api():
+            return normalise_skills_locally(text)
     
-    return result
+    key = _request_key(text, model, temperature, max_completion_tokens, top_p, stop)
+    if use_cache:
+        cached = get_cache().get(key)
+        if cached is not None:
+            return cached
+    
+    async def request():
+        # Spans are per thread, so this one has no parent stage
+        with span("groq", model=model, mode="async"):
+            completion = await get_async_client().chat.completions.create(
+                model=model,
+                messages=_build_messages(text),
+                temperature=temperature,
+                max_completion_tokens=max_completion_tokens,
+                top_p=top_p,
+                stream=stream,
+                stop=stop,
+            )
+            if stream:
+                parts = []
+                async for chunk in completion:
+                    parts.append(chunk.choices[0].delta.content or "")
+                result = "".join(parts)
+            else:
+                result = (completion.choices[0].message.content or "").strip()
+        if deterministic and not result:
+            raise ValueError("Groq returned an empty completion")
+        if use_cache:
+            get_cache().set(key, result)
+        return result
+    
+    in_flight = _async_in_flight.setdefault(asyncio.get_running_loop(), {})
+    task = in_flight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(request())
+        in_flight[key] = task
+        task.add_done_callback(lambda _: in_flight.pop(key, None))
+    try:
+        # shield: one caller being cancelled must not cancel the shared request
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        increment("external_call_failures", service="groq")
+        if not deterministic:
+            raise
+        warning(f"Groq request failed, using the local normaliser: {e}", error=str(e))
+        return normalise_skills_locally(text)
 
 # # For testing purposes:
 # if __name__ == '__main__':
@@ -0,0 +1,291 @@
+# course_catalogue.py
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from instrumentation import span, increment, warning, register_collector
+
+load_dotenv()
+API_KEY = os.getenv("API_KEY")
+
+SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+CATALOGUE_PATH = os.getenv(
+    "COURSE_CATALOGUE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".course_catalogue.sqlite3")
+)
+FRESH_SECONDS = 7 * 24 * 3600       # served as is
+MAX_STALE_SECONDS = 90 * 24 * 3600  # served while being refreshed in the background
+DAILY_QUOTA_UNITS = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+SEARCH_COST = 100                   # quota units per search.list call
+REQUESTS_PER_SECOND = 5.0
+
+def normalise_skill(skill):
+    """
+    Returns the catalogue key of a skill: lower-cased with collapsed whitespace.
+    """
+    return " ".join(skill.lower().split())
+
+def course_query(skill):
+    """
+    Returns the YouTube search query for a skill.
+    """
+    skill = skill.strip()
+    return f"{skill} full course" if "course" not in skill.lower() else skill
+
+class QuotaExceeded(Exception):
+    """Raised when the daily YouTube quota is used up."""
+
+class RateLimiter:
+    """
+    Token bucket for the request rate plus a daily quota budget in YouTube
+    units. The budget resets at the start of each UTC day; YouTube itself
+    resets at midnight Pacific time, so a quotaExceeded reply from the API
+    also exhausts the budget until the next reset.
+    """
+
+    def __init__(self, rate=REQUESTS_PER_SECOND, burst=5, daily_units=DAILY_QUOTA_UNITS):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.daily_units = daily_units
+        self.used_units = 0
+        self.day = time.gmtime().tm_yday
+        self.lock = threading.Lock()
+
+    def acquire(self, cost=SEARCH_COST):
+        """
+        Waits for a request slot and charges `cost` quota units. Raises
+        QuotaExceeded instead of waiting when the daily budget is spent.
+        """
+        while True:
+            with self.lock:
+                self._reset_day()
+                if self.used_units + cost > self.daily_units:
+                    raise QuotaExceeded("Daily YouTube quota exhausted")
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.used_units += cost
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def exhaust(self):
+        """
+        Marks today's quota as used up (e.g. after a quotaExceeded reply).
+        """
+        with self.lock:
+            self._reset_day()
+            self.used_units = self.daily_units
+
+    def remaining_units(self):
+        with self.lock:
+            self._reset_day()
+            return self.daily_units - self.used_units
+
+    def _reset_day(self):
+        day = time.gmtime().tm_yday
+        if day != self.day:
+            self.day = day
+            self.used_units = 0
+
+class CourseCatalogue:
+    """
+    Course lookups backed by a local SQLite store keyed by normalised skill.
+
+    Fresh entries are served from the store; stale ones are served
+    immediately and refreshed in the background (stale-while-revalidate);
+    missing ones are fetched from YouTube through a shared, pooled
+    requests.Session under the rate limiter. When the quota is exhausted,
+    whatever the store has (even expired) is returned instead of nothing.
+    """
+
+    def __init__(self, path=CATALOGUE_PATH, api_key=API_KEY, max_results=2, timeout=3,
+                 limiter=None, fresh_seconds=FRESH_SECONDS, max_stale_seconds=MAX_STALE_SECONDS):
+        self.api_key = api_key
+        self.max_results = max_results
+        self.timeout = timeout
+        self.limiter = limiter or RateLimiter()
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.counters = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "fetches": 0,
+                         "fetch_errors": 0, "quota_skips": 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS courses ("
+            "skill TEXT PRIMARY KEY, results TEXT NOT NULL, fetched REAL NOT NULL)"
+        )
+        self.connection.commit()
+        self.refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="course-refresh")
+        self.refreshing = set()
+
+    def lookup(self, skill):
+        """
+        Returns [(title, url), ...] for the skill.
+        """
+        key = normalise_skill(skill)
+        entry = self._load(key)
+        age = time.time() - entry[1] if entry else None
+        if entry and age < self.fresh_seconds:
+            self._count("fresh_hits")
+            return entry[0][:self.max_results]
+        if entry and age < self.max_stale_seconds:
+            self._count("stale_hits")
+            self._refresh_later(skill, key)
+            return entry[0][:self.max_results]
+
+        self._count("misses")
+        try:
+            return self._fetch(skill, key)[:self.max_results]
+        except QuotaExceeded:
+            self._count("quota_skips")
+        except Exception as e:
+            self._count("fetch_errors")
+            warning(f"Error searching {skill}: {str(e)[:50]}", skill=skill, error=str(e))
+        return entry[0][:self.max_results] if entry else []
+
+    def lookup_many(self, skills, max_workers=5):
+        """
+        Returns {skill: [(title, url), ...]} for the skills. Lookups run in
+        parallel; those answered from the store return without a request.
+        """
+        skills = list(skills)
+        # Skills with the same key share one lookup
+        unique = list({normalise_skill(skill): skill for skill in reversed(skills)}.items())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip((key for key, _ in unique), executor.map(self.lookup, (skill for _, skill in unique))))
+        return {skill: results[normalise_skill(skill)] for skill in skills}
+
+    def prefetch(self, skills):
+        """
+        Fills the store with skills that are missing or expired, stopping
+        when the quota runs out. Returns the number of skills fetched.
+        """
+        fetched = 0
+        for skill in skills:
+            key = normalise_skill(skill)
+            entry = self._load(key)
+            if entry and time.time() - entry[1] < self.fresh_seconds:
+                continue
+            try:
+                self._fetch(skill, key)
+                fetched += 1
+            except QuotaExceeded:
+                break
+            except Exception as e:
+                warning(f"Error searching {skill}: {str(e)[:50]}", skill=skill, error=str(e))
+        return fetched
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats["stored"] = self.connection.execute("SELECT COUNT(*) FROM courses").fetchone()[0]
+        stats["remaining_quota_units"] = self.limiter.remaining_units()
+        return stats
+
+    def _fetch(self, skill, key):
+        self.limiter.acquire()
+        self._count("fetches")
+        try:
+            with span("youtube", skill=key):
+                response = self.session.get(SEARCH_URL, timeout=self.timeout, params={
+                    "part": "snippet",
+                    "q": course_query(skill),
+                    "type": "video",
+                    "key": self.api_key,
+                    "maxResults": self.max_results,
+                    "videoDuration": "long",
+                })
+                data = response.json()
+                if response.status_code == 403 and "quotaExceeded" in json.dumps(data.get("error", {})):
+                    self.limiter.exhaust()
+                    raise QuotaExceeded("YouTube reported quotaExceeded")
+                response.raise_for_status()
+        except Exception:
+            increment("external_call_failures", service="youtube")
+            raise
+        results = [
+            (item['snippet']['title'], f"https://www.youtube.com/watch?v={item['id']['videoId']}")
+            for item in data.get('items', [])
+        ]
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO courses (skill, results, fetched) VALUES (?, ?, ?)",
+                (key, json.dumps(results), time.time())
+            )
+            self.connection.commit()
+        return results
+
+    def _load(self, key):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT results, fetched FROM courses WHERE skill = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return [tuple(result) for result in json.loads(row[0])], row[1]
+
+    def _refresh_later(self, skill, key):
+        with self.lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch(skill, key)
+            except QuotaExceeded:
+                self._count("quota_skips")
+            except Exception as e:
+                self._count("fetch_errors")
+                warning(f"Error refreshing {skill}: {str(e)[:50]}", skill=skill, error=str(e))
+            finally:
+                with self.lock:
+                    self.refreshing.discard(key)
+
+        self.refresher.submit(refresh)
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+# Process-wide catalogue, shared by the app and the recommendation module
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+def get_course_catalogue():
+    """
+    Returns the shared CourseCatalogue, creating it on first use.
+    """
+    global _catalogue
+    if _catalogue is None:
+        with _catalogue_lock:
+            if _catalogue is None:
+                _catalogue = CourseCatalogue()
+                register_collector("course_catalogue", _catalogue.stats)
+    return _catalogue
+
+if __name__ == '__main__':
+    # Prefill the store within today's quota: python course_catalogue.py [skill_set.txt]
+    path = sys.argv[1] if len(sys.argv) > 1 else "skill_set.txt"
+    with open(path, "r") as f:
+        skills = [line.strip() for line in f if line.strip()]
+    catalogue = get_course_catalogue()
+    print(f"Fetched {catalogue.prefetch(skills)} skills")
+    print(catalogue.stats())
@@ -0,0 +1,138 @@
+# gazetteer.py
+import os
+import re
+import time
+import threading
+from instrumentation import register_collector
+
+# Words and single punctuation marks, so "Church & Dwight" and
+# "church &dwight" normalise to the same key
+TOKEN_REGEX = re.compile(r"\w+|[^\w\s]")
+
+def normalise(text):
+    """
+    Returns the lookup key of a phrase: its lower-cased tokens as a tuple.
+    """
+    return tuple(token.lower() for token in TOKEN_REGEX.findall(text))
+
+class Gazetteer:
+    """
+    In-memory index over a corpus file with one entry per line.
+
+    Entries are stored in a hash map keyed by their normalised tokens, plus
+    the set of all entry prefixes, which acts as a trie for longest-match
+    scanning over a token stream.
+    """
+
+    def __init__(self, path):
+        start = time.perf_counter()
+        self.path = path
+        self.stat = _stat(path)
+        # Normalised tokens -> entry as written in the corpus (first spelling wins)
+        self.entries = {}
+        self.prefixes = set()
+        with open(path, "r", encoding="utf-8") as corpus_file:
+            for line in corpus_file:
+                entry = line.strip()
+                key = normalise(entry)
+                if key and key not in self.entries:
+                    self.entries[key] = entry
+                    for n in range(1, len(key)):
+                        self.prefixes.add(key[:n])
+        self.load_seconds = time.perf_counter() - start
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, phrase):
+        """
+        Returns the corpus entry equal to the phrase after normalisation, or None.
+        """
+        start = time.perf_counter()
+        entry = self.entries.get(normalise(phrase))
+        self._record(start)
+        return entry
+
+    def lookup_all(self, phrases):
+        """
+        Returns the distinct corpus entries matched exactly by any of the phrases.
+        """
+        start = time.perf_counter()
+        found = [self.entries.get(normalise(phrase)) for phrase in phrases]
+        self._record(start)
+        return list(dict.fromkeys(entry for entry in found if entry is not None))
+
+    def find(self, text, capitalised_only=False):
+        """
+        Scans the text's token stream and returns (entry, start_char, end_char)
+        for the longest entry starting at each position, without overlaps.
+
+        With `capitalised_only`, matches whose first character is not an
+        upper-case letter or digit are skipped (useful for proper nouns such
+        as company names).
+        """
+        start = time.perf_counter()
+        tokens = list(TOKEN_REGEX.finditer(text))
+        keys = [token.group().lower() for token in tokens]
+        found = []
+        i = 0
+        while i < len(tokens):
+            longest = None
+            j = i + 1
+            while j <= len(tokens):
+                key = tuple(keys[i:j])
+                if key in self.entries:
+                    longest = j
+                if key not in self.prefixes:
+                    break
+                j += 1
+            if longest is not None:
+                start_char, end_char = tokens[i].start(), tokens[longest - 1].end()
+                first = text[start_char]
+                if not capitalised_only or first.isupper() or first.isdigit():
+                    found.append((self.entries[tuple(keys[i:longest])], start_char, end_char))
+                    i = longest
+                    continue
+            i += 1
+        self._record(start)
+        return found
+
+    def stats(self):
+        """
+        Returns load and lookup timings (seconds) for reporting.
+        """
+        return {
+            "entries": len(self.entries),
+            "load_seconds": self.load_seconds,
+            "lookups": self.lookups,
+            "lookup_seconds": self.lookup_seconds,
+        }
+
+    def _record(self, start):
+        self.lookups += 1
+        self.lookup_seconds += time.perf_counter() - start
+
+def _stat(path):
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+# Loaded gazetteers, keyed by absolute corpus path
+_gazetteers = {}
+_lock = threading.Lock()
+
+def get_gazetteer(path):
+    """
+    Returns the Gazetteer for `path`, loading the file once per process and
+    again only if it changes on disk.
+    """
+    key = os.path.abspath(path)
+    with _lock:
+        gazetteer = _gazetteers.get(key)
+        if gazetteer is None or gazetteer.stat != _stat(path):
+            gazetteer = Gazetteer(path)
+            _gazetteers[key] = gazetteer
+            register_collector("gazetteer_" + os.path.splitext(os.path.basename(path))[0].replace("-", "_"),
+                               gazetteer.stats)
+        return gazetteer
@@ -0,0 +1,242 @@
+# instrumentation.py
+"""
+Spans, counters and structured logs for the resume pipeline.
+
+Disabled by default: span() then returns a shared no-op object and
+increment()/log_event() return at once, so instrumented code costs a
+function call. Enable it with INSTRUMENTATION=1 (or enable()) and set
+INSTRUMENTATION_LOG to a file, or "-" for stderr, to also write every span
+and event as a JSON line. render_prometheus() exports the stage latency
+histograms, counters and registered collectors in the Prometheus text format.
+"""
+import os
+import sys
+import json
+import time
+import threading
+
+ENABLED = os.getenv("INSTRUMENTATION", "") not in ("", "0", "false")
+LOG_PATH = os.getenv("INSTRUMENTATION_LOG") or None
+METRIC_PREFIX = "resume_"
+# Upper bounds (seconds) of the stage latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_local = threading.local()
+_stages = {}      # (stage, status) -> [count, sum, bucket counts]
+_counters = {}    # (name, sorted label items) -> value
+_collectors = {}  # name -> callable returning {key: number}
+_log_file = None
+
+def enable(enabled=True, log_path=None):
+    """
+    Turns instrumentation on or off; `log_path` ("-" for stderr) also
+    turns on JSON logs.
+    """
+    global ENABLED, LOG_PATH, _log_file
+    with _lock:
+        ENABLED = enabled
+        if log_path is not None and log_path != LOG_PATH:
+            LOG_PATH, _log_file = log_path, None
+
+def reset():
+    """
+    Clears every recorded span and counter (collectors are kept).
+    """
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Span:
+    """
+    Times a stage. On exit its duration goes into the stage histogram and,
+    with JSON logs on, a "span" event is written with its parent stage,
+    status and attributes.
+    """
+    __slots__ = ("name", "attrs", "parent", "start")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.start = None
+
+    def set(self, **attrs):
+        """
+        Adds attributes to the span's log event.
+        """
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        _stack().pop()
+        status = "ok" if exc_type is None else "error"
+        _observe(self.name, status, seconds)
+        if LOG_PATH:
+            event = {"event": "span", "span": self.name, "parent": self.parent, "status": status,
+                     "seconds": round(seconds, 6)}
+            if exc is not None:
+                event["error"] = f"{exc_type.__name__}: {exc}"
+            event.update(self.attrs)
+            _write(event)
+        return False
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def span(name, **attrs):
+    """
+    Returns a context manager timing the stage `name`.
+    """
+    if not ENABLED:
+        return _NOOP_SPAN
+    return Span(name, attrs)
+
+def increment(name, amount=1, **labels):
+    """
+    Adds `amount` to the counter `name` with the given labels.
+    """
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def log_event(event, **fields):
+    """
+    Writes a JSON log event when instrumentation and JSON logs are on.
+    """
+    if ENABLED and LOG_PATH:
+        _write(dict(fields, event=event))
+
+def warning(message, **fields):
+    """
+    Reports a recoverable problem: a JSON "warning" event (plus a warnings
+    counter) when instrumentation is on, otherwise the message on stdout.
+    """
+    if not ENABLED:
+        print(message)
+        return
+    increment("warnings")
+    if LOG_PATH:
+        _write(dict(fields, event="warning", message=message))
+    else:
+        print(message)
+
+def register_collector(name, func):
+    """
+    Registers `func`, returning {key: number}, to be read on every export
+    as the gauges `<name>_<key>`. Used for counters kept elsewhere, such as
+    the result cache's hits and misses.
+    """
+    with _lock:
+        _collectors[name] = func
+
+def _observe(stage, status, seconds):
+    key = (stage, status)
+    with _lock:
+        entry = _stages.get(key)
+        if entry is None:
+            entry = _stages[key] = [0, 0.0, [0] * len(BUCKETS)]
+        entry[0] += 1
+        entry[1] += seconds
+        buckets = entry[2]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                buckets[i] += 1
+
+def _write(event):
+    global _log_file
+    event.setdefault("time", round(time.time(), 6))
+    event.setdefault("thread", threading.current_thread().name)
+    line = json.dumps(event, default=str) + "\n"
+    with _lock:
+        if _log_file is None:
+            _log_file = sys.stderr if LOG_PATH == "-" else open(LOG_PATH, "a", encoding="utf-8")
+        _log_file.write(line)
+        _log_file.flush()
+
+def _collect():
+    with _lock:
+        collectors = list(_collectors.items())
+    gauges = {}
+    for name, func in collectors:
+        try:
+            values = func()
+        except Exception as e:
+            values = {}
+            increment("collector_errors", collector=name)
+            log_event("collector_error", collector=name, error=str(e))
+        for key, value in values.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                gauges[f"{name}_{key}"] = value
+    return gauges
+
+def snapshot():
+    """
+    Returns every stage histogram, counter and collector value as a dict,
+    sorted by name (the data behind render_prometheus and /health).
+    """
+    with _lock:
+        stages = [{"stage": stage, "status": status, "count": count, "seconds": total, "buckets": list(buckets)}
+                  for (stage, status), (count, total, buckets) in sorted(_stages.items())]
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(_counters.items())]
+    return {"enabled": ENABLED, "stages": stages, "counters": counters, "gauges": dict(sorted(_collect().items()))}
+
+def _labels(items):
+    escaped = ('{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+               for key, value in items)
+    return "{" + ",".join(escaped) + "}" if items else ""
+
+def render_prometheus():
+    """
+    Returns the metrics in the Prometheus text exposition format.
+    """
+    metrics = snapshot()
+    lines = []
+
+    name = METRIC_PREFIX + "stage_seconds"
+    lines += [f"# HELP {name} Duration of each pipeline stage.", f"# TYPE {name} histogram"]
+    for stage in metrics["stages"]:
+        labels = [("stage", stage["stage"]), ("status", stage["status"])]
+        for bound, bucket_count in zip(BUCKETS, stage["buckets"]):
+            lines.append(f"{name}_bucket{_labels(labels + [('le', repr(bound))])} {bucket_count}")
+        lines.append(f"{name}_bucket{_labels(labels + [('le', '+Inf')])} {stage['count']}")
+        lines.append(f"{name}_sum{_labels(labels)} {stage['seconds']:.6f}")
+        lines.append(f"{name}_count{_labels(labels)} {stage['count']}")
+
+    typed = set()
+    for counter in metrics["counters"]:
+        name = f"{METRIC_PREFIX}{counter['name']}_total"
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_labels(list(counter['labels'].items()))} {counter['value']}")
+
+    for gauge, value in metrics["gauges"].items():
+        name = METRIC_PREFIX + gauge
+        lines += [f"# TYPE {name} gauge", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,20 @@
+# model_registry.py
+import threading
+import spacy
+
+# One loaded pipeline per model name, shared by the whole process
+_models = {}
+_lock = threading.Lock()
+
+def get_model(name):
+    """
+    Returns the spaCy pipeline for `name`, loading it on first use only.
+    """
+    model = _models.get(name)
+    if model is None:
+        with _lock:
+            model = _models.get(name)
+            if model is None:
+                model = spacy.load(name)
+                _models[name] = model
+    return model
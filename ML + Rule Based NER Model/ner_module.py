@@ -1,82 +1,152 @@
+import os
 import re
-import nltk
 import spacy
 import string
-import pandas as pd
-from nltk.corpus import stopwords
-stop = stopwords.words('english')
+import threading
+from functools import lru_cache
 from spacy.matcher import Matcher, PhraseMatcher
-# If you wish to use SkillNER from AnasAito’s package, try installing it:
-# pip install skillNer
-try:
-    from skillNer.general_params import SKILL_DB
-    from skillNer.skill_extractor_class import SkillExtractor
-except ModuleNotFoundError:
-    # Fallback: set these to None if the package isn't installed.
-    SKILL_DB = None
-    SkillExtractor = None
+from spacy.tokens import Doc
+from collections import namedtuple
 import warnings
 warnings.filterwarnings("ignore")
+from model_registry import get_model
+from skill_index import get_skill_index
+from gazetteer import get_gazetteer
+from result_cache import get_cache, make_key
+from instrumentation import span, increment, warning, log_event
+
+# Nothing below loads a model, NLTK data or SkillNER at import time: the
+# spaCy pipeline, the Matcher, the stopwords and SkillNER are all loaded on
+# first use (or ahead of time by warm_up_tasks()), so importing this module
+# stays cheap.
 
 # (Optional: The following PDF conversion function is retained for reference.
 #  In this CSV-based version we won't use it.)
-import fitz
-def pdf_to_text(document):
-    doc = fitz.open(document)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    return text
-
-# Import additional NLTK modules for tokenization, POS tagging, and stemming
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords, wordnet
-from nltk import pos_tag
-from nltk.stem import WordNetLemmatizer, SnowballStemmer
-warnings.filterwarnings("ignore")
+import text_extraction
+def pdf_to_text(document, max_pages=None):
+    return text_extraction.extract_text(document, max_pages=max_pages)
+
+@lru_cache(maxsize=1)
+def load_skillner():
+    """
+    Returns (SKILL_DB, SkillExtractor) from SkillNER, importing it on first
+    use, or (None, None) if the package isn't installed (pip install skillNer).
+    """
+    try:
+        from skillNer.general_params import SKILL_DB
+        from skillNer.skill_extractor_class import SkillExtractor
+    except ModuleNotFoundError:
+        return None, None
+    return SKILL_DB, SkillExtractor
+
+@lru_cache(maxsize=1)
+def get_stopwords():
+    """
+    Returns the NLTK English stopwords, loading the corpus on first use.
+    """
+    from nltk.corpus import stopwords
+    return stopwords.words('english')
+
+@lru_cache(maxsize=1)
+def get_stopword_set():
+    """
+    Returns the stopwords as a frozenset, built once.
+    """
+    return frozenset(get_stopwords())
+
+@lru_cache(maxsize=1)
+def get_lemmatizer():
+    """
+    Returns the shared WordNetLemmatizer.
+    """
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+# First letter of a Penn Treebank tag -> WordNet POS (wordnet.ADJ, NOUN, VERB, ADV)
+WORDNET_POS = {"J": "a", "N": "n", "V": "v", "R": "r"}
+
+def wordnet_pos(tag):
+    """
+    Returns the WordNet POS for a Penn Treebank tag, defaulting to noun.
+    """
+    return WORDNET_POS.get(tag[:1].upper(), "n")
 
 def getWordnetPos(words):
-    tag = pos_tag([words])[0][1][0].upper()
-    tag_dict = {"J": wordnet.ADJ,
-                "N": wordnet.NOUN,
-                "V": wordnet.VERB,
-                "R": wordnet.ADV}
-    return tag_dict.get(tag, wordnet.NOUN)
-
-def cv_preprocessing(cv_data):
+    from nltk import pos_tag
+    return wordnet_pos(pos_tag([words])[0][1])
+
+@lru_cache(maxsize=50000)
+def lemmatize(token, pos):
+    """
+    Returns the WordNet lemma of a token for a WordNet POS, memoised: resume
+    vocabulary repeats a lot, and each uncached lookup walks WordNet.
+    """
+    return get_lemmatizer().lemmatize(token, pos)
+
+def cv_preprocessing(cv_data, doc=None):
+    """
+    Returns the text's non-stopword tokens, lemmatised and joined by spaces.
+
+    The tokens are POS-tagged in one pos_tag call, in context, and lemmas
+    are memoised per (token, POS). Pass `doc`, a spaCy parse of the same
+    text, to use spaCy's lemmas instead and skip NLTK altogether.
+    """
+    stop_words = get_stopword_set()
+    if doc is not None:
+        return ' '.join(token.lemma_ for token in doc if not token.is_space and token.lower_ not in stop_words)
+
+    from nltk import pos_tag
+    from nltk.tokenize import word_tokenize
     # Tokenization
     tokenized_text = word_tokenize(cv_data)
     # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    filter_text = []
-    for token in tokenized_text:
-        if token.lower() not in stop_words:
-            filter_text.append(token)
+    filter_text = [token for token in tokenized_text if token.lower() not in stop_words]
     # POS tagging and lemmatization
-    lemmatizer = WordNetLemmatizer()
-    lemmatizeResults = [lemmatizer.lemmatize(token, getWordnetPos(token)) for token in filter_text]
+    lemmatizeResults = [lemmatize(token, wordnet_pos(tag)) for token, tag in pos_tag(filter_text)]
     return ' '.join(lemmatizeResults)
 
-# Initialize spaCy model and matcher for later use
-nlp = spacy.load("en_core_web_lg")
-matcher = Matcher(nlp.vocab)
+# Main spaCy model, loaded through the registry on first use
+MODEL_NAME = "en_core_web_lg"
+
+def get_nlp():
+    """
+    Returns the main spaCy pipeline, loading it on first use.
+    """
+    return get_model(MODEL_NAME)
+
+# First name and last name are always proper nouns.
+# The 'OP': '?' makes the second proper noun optional.
+NAME_PATTERN = [{'POS': 'PROPN'}, {'POS': 'PROPN', 'OP': '?'}]
+
+# Model used for ORG entities (universities and companies). Set NER_ORG_MODEL
+# to en_core_web_lg to reuse the main model instead of loading a second one.
+ORG_MODEL_NAME = os.getenv("NER_ORG_MODEL", "en_core_web_md")
+
+def parse_resume(resume_text):
+    """
+    Runs the spaCy pipeline once and collects the matcher hits, so every
+    extractor can read from the same Doc instead of re-parsing the text.
+    """
+    doc = get_nlp()(resume_text)
+    return doc, get_matcher()(doc)
+
+def _matches_for(label, doc, matches=None):
+    """
+    Returns the (match_id, start, end) hits for one matcher label.
+    """
+    if matches is None:
+        matches = get_matcher()(doc)
+    match_id = get_nlp().vocab.strings[label]
+    return [match for match in matches if match[0] == match_id]
 
 # -----------------------------
 # 1 - Rule based Functions
 # -----------------------------
-def extract_names(resume_text):
-    nlp_text = nlp(resume_text)
-    
-    # First name and last name are always proper nouns.
-    # The 'OP': '?' makes the second proper noun optional.
-    pattern = [{'POS': 'PROPN'}, {'POS': 'PROPN', 'OP': '?'}]
-
-    matcher.add('NAME', [pattern])
-    
-    matches = matcher(nlp_text)
+def extract_names(resume_text, doc=None, matches=None):
+    nlp_text = doc if doc is not None else get_nlp()(resume_text)
     
     names = []
-    for match_id, start, end in matches:
+    for match_id, start, end in _matches_for('NAME', nlp_text, matches):
         span = nlp_text[start:end]
         if len(span) == 1:
             names.append(span.text)
@@ -122,67 +192,93 @@ degree_patterns = [
     [{"LOWER": "bachelor"}, {"LOWER": "of"}, {"LOWER": "computer"}, {"LOWER": "science"}]
 ]
 
-matcher.add("DEGREE", degree_patterns)
+_matcher = None
+_matcher_lock = threading.Lock()
 
-def extract_degree(resume_text):
+def get_matcher():
+    """
+    Returns the NAME/DEGREE Matcher over the main model's vocab, built once.
+    """
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                matcher = Matcher(get_nlp().vocab)
+                matcher.add('NAME', [NAME_PATTERN])
+                matcher.add("DEGREE", degree_patterns)
+                _matcher = matcher
+    return _matcher
+
+def extract_degree(resume_text, doc=None, matches=None):
     degree_matches = []
-    nlp_text = nlp(resume_text)
-    matches = matcher(nlp_text)
+    nlp_text = doc if doc is not None else get_nlp()(resume_text)
     
-    for match_id, start, end in matches:
+    for match_id, start, end in _matches_for('DEGREE', nlp_text, matches):
         degree_matches.append(nlp_text[start:end].text)
     
     valid_degrees = [degree for degree in degree_matches if degree.lower().startswith(('bachelor', 'master', 'doctor'))]
     return valid_degrees
 
-def extract_grad_years(resume_text):
-    doc = nlp(resume_text)
+def extract_grad_years(resume_text, doc=None):
+    doc = doc if doc is not None else get_nlp()(resume_text)
     grad_years = []
     for ent in doc.ents:
         if ent.label_ == 'DATE':
             grad_years.append(ent.text)
     return grad_years
 
-def extract_locations(resume_text):
-    doc = nlp(resume_text)
+def extract_locations(resume_text, doc=None):
+    doc = doc if doc is not None else get_nlp()(resume_text)
     locations = []
     for ent in doc.ents:
         if ent.label_ == 'GPE':
             locations.append(ent.text)
     return locations 
 
-def extract_organization(text):
-    nlp_md = spacy.load('en_core_web_md')
-    doc = nlp_md(text)
+def extract_organization(text, doc=None, model_name=None):
+    """
+    Returns the ORG entities of the text. Pass `doc` to reuse a Doc already
+    parsed with the ORG model instead of parsing the text again.
+    """
+    if doc is None:
+        nlp_org = get_model(model_name or ORG_MODEL_NAME)
+        doc = nlp_org(text)
     orgs = []
     for ent in doc.ents:
         if ent.label_ == 'ORG':
             orgs.append(ent.text)
     return orgs
 
-def extract_company(resume_text):
-    resume_text = extract_organization(resume_text)
-    with open("company.txt", "r") as corpus_file:
-        corpus = corpus_file.read().split('\n')
-    matches = []
-    for text in corpus:
-        if any(keyword.lower() == text.lower() for keyword in resume_text):
-            matches.append(text)
-    return matches
+COMPANY_PATH = "company.txt"
+JOB_TITLES_PATH = "job-titles.txt"
+
+def extract_company(resume_text, orgs=None):
+    """
+    Returns the company.txt entries named in the resume: ORG entities that
+    match an entry exactly, plus capitalised entries found in the token stream.
+    """
+    if orgs is None:
+        orgs = extract_organization(resume_text)
+    companies = get_gazetteer(COMPANY_PATH)
+    matches = companies.lookup_all(orgs)
+    matches += [company for company, _, _ in companies.find(resume_text, capitalised_only=True)]
+    return list(dict.fromkeys(matches))
 
-def extract_designations(resume_text):
-    doc = nlp(resume_text)
+def extract_designations(resume_text, doc=None):
+    """
+    Returns the job-titles.txt entries named in the resume: PERSON entities
+    that match a title exactly (spaCy often tags titles as PERSON), plus the
+    longest titles found in the token stream.
+    """
+    doc = doc if doc is not None else get_nlp()(resume_text)
     nouns = []
     for ent in doc.ents:
         if ent.label_ == 'PERSON':
             nouns.append(ent.text)
-    with open("job-titles.txt", "r") as corpus_file:
-        corpus = corpus_file.read().split('\n')
-    matching_job_titles = []
-    for title in corpus:
-        if any(noun.lower() == title.lower() for noun in nouns):
-            matching_job_titles.append(title)
-    return matching_job_titles
+    job_titles = get_gazetteer(JOB_TITLES_PATH)
+    matching_job_titles = job_titles.lookup_all(nouns)
+    matching_job_titles += [title for title, _, _ in job_titles.find(doc.text)]
+    return list(dict.fromkeys(matching_job_titles))
 
 # -------------------------------------------------------
 # 2 - Combination of Machine Learning and Rule-based NER Functions
@@ -194,44 +290,96 @@ def clean_string(text):
     """
     return text.translate(str.maketrans("", "", string.punctuation)).lower()
 
-def get_skills_and_scores(resume_text):
+SKILL_SET_PATH = "skill_set.txt"
+
+def get_skill_matches(resume_text):
+    """
+    Returns (skill, start_char, end_char) for every skill_set.txt skill found
+    in the text, for highlighting.
+    """
+    return get_skill_index(get_nlp(), SKILL_SET_PATH).find(resume_text)
+
+# Bump when SkillNER's output handling changes so cached annotations are not reused
+SKILLNER_VERSION = "1"
+
+_skill_extractor = None
+_skill_extractor_lock = threading.Lock()
+_skill_extractor_failed = False
+
+def get_skill_extractor():
+    """
+    Returns the process-wide SkillNER SkillExtractor, or None if SkillNER is
+    not installed or could not be initialised. Building it compiles SkillNER's
+    phrase matchers over the whole SKILL_DB, so it is done once; annotate()
+    only reads the matchers and can be called from several threads.
+    """
+    global _skill_extractor, _skill_extractor_failed
+    if _skill_extractor is None and not _skill_extractor_failed:
+        with _skill_extractor_lock:
+            if _skill_extractor is None and not _skill_extractor_failed:
+                SKILL_DB, SkillExtractor = load_skillner()
+                if SKILL_DB is None or SkillExtractor is None:
+                    _skill_extractor_failed = True
+                    return None
+                try:
+                    _skill_extractor = SkillExtractor(get_nlp(), SKILL_DB, PhraseMatcher)
+                except Exception as e:
+                    # Not retried: every call would pay for the failed build again
+                    warning(f"SkillNER disabled, could not initialise it: {e}", error=str(e))
+                    _skill_extractor_failed = True
+    return _skill_extractor
+
+def annotate_skills(resume_text):
+    """
+    Returns SkillNER's (skills, scores) for the text: full matches first,
+    then scored n-grams. Results are cached by a hash of the text (the
+    skills section), so a section already seen costs no SkillNER call.
+    Returns ([], []) when SkillNER is unavailable.
+    """
+    skill_extractor = get_skill_extractor()
+    if skill_extractor is None or not resume_text.strip():
+        return [], []
+
+    def annotate():
+        with span("skillner"):
+            results = skill_extractor.annotate(resume_text)['results']
+        matches = results['full_matches'] + results['ngram_scored']
+        return [[match['doc_node_value'] for match in matches], [float(match['score']) for match in matches]]
+
+    cache_key = make_key("skillner", resume_text, model=MODEL_NAME, prompt_version=SKILLNER_VERSION)
+    skills, scores = get_cache().get_or_compute(cache_key, annotate)
+    return skills, scores
+
+def get_skills_and_scores(resume_text, timings=None):
     """
     Extracts skills and their scores from the resume text by combining:
       1. SkillNER-based extraction (if available)
       2. Fallback rule-based extraction using a skill corpus ("skill_set.txt")
-    
+
+    The seconds spent in each are added to `timings` (if given) as
+    "skillner" and "skill_fallback".
+
     Returns:
         (list, list): A tuple of (combined_skills, combined_scores)
     """
+    timings = {} if timings is None else timings
     # Initialize lists for the SkillNER results.
     skills_ner, scores_ner = [], []
     try:
-        # Try to use SkillNER if available.
-        from spacy.matcher import PhraseMatcher
-        if SKILL_DB is not None and SkillExtractor is not None:
-            skill_extractor = SkillExtractor(nlp, SKILL_DB, PhraseMatcher)
-            annotations = skill_extractor.annotate(resume_text)
-            skills_full = [match['doc_node_value'] for match in annotations['results']['full_matches']]
-            skills_partial = [match['doc_node_value'] for match in annotations['results']['ngram_scored']]
-            score_full = [match['score'] for match in annotations['results']['full_matches']]
-            score_partial = [match['score'] for match in annotations['results']['ngram_scored']]
-            skills_ner = skills_full + skills_partial
-            scores_ner = score_full + score_partial
+        skills_ner, scores_ner = _timed(timings, "skillner", annotate_skills, resume_text)
     except Exception as e:
-        # If any error occurs, we just keep the lists empty.
-        skills_ner, scores_ner = [], []
+        # The fallback still runs; the error is reported instead of hidden
+        increment("skillner_failures")
+        warning(f"SkillNER annotation failed: {e}", error=str(e))
 
     # Fallback: Use rule-based extraction from "skill_set.txt".
     fallback_skills, fallback_scores = [], []
     try:
-        with open("skill_set.txt", "r") as corpus_file:
-            corpus = corpus_file.read().splitlines()
-        # Use the clean_string function to remove punctuation and lower-case both sides.
-        cleaned_resume = clean_string(resume_text)
-        fallback_skills = [keyword for keyword in corpus if clean_string(keyword) in cleaned_resume]
+        # One pass over the text with the precompiled skill index.
+        fallback_skills = _timed(timings, "skill_fallback", get_skill_index(get_nlp(), SKILL_SET_PATH).skills, resume_text)
         fallback_scores = [1.0] * len(fallback_skills)
     except FileNotFoundError:
-        fallback_skills, fallback_scores = [], []
+        warning(f"Skill list {SKILL_SET_PATH} not found, skipping rule-based skills")
 
     # Combine the two sets. For each skill, if it appears in both, keep the maximum score.
     combined_skills = {}
@@ -255,94 +403,279 @@ def get_skills_and_scores(resume_text):
     return final_skills, final_scores
 
 
-def get_sections(text):
-    """
-    Splits the resume text into sections based on common header keywords.
-    Returns a dictionary where keys are the section headers.
-    """
-    summary_regex = r"(Professional Summary|Summary)"
-    objective_regex = r"(Objective|Career Objective)"
-    education_regex = r"(Education|Academic Background|Academic Qualifications)"
-    work_experience_regex = r"(PROFESSIONAL EXPERIENCE|Work Experience|Professional Experience|(^|\n)[ \t]*(EXPERIENCE)[ \t]*(\n|$))"
-    skills_regex = r"(Skills|Technical Skill(s|-set)?|Computer Skill(s|-set)?)"
+# Section headers, compiled once. The combined alternation is matched
+# case-sensitively, as before; each kind is a named group.
+SECTION_PATTERNS = {
+    "summary": r"(Professional Summary|Summary)",
+    "objective": r"(Objective|Career Objective)",
+    "education": r"(Education|Academic Background|Academic Qualifications)",
+    "experience": r"(PROFESSIONAL EXPERIENCE|Work Experience|Professional Experience|(^|\n)[ \t]*(EXPERIENCE)[ \t]*(\n|$))",
+    "skills": r"(Skills|Technical Skills|Computer Skills|Technical skill-set)",
+}
+SECTION_REGEX = re.compile('|'.join("(?P<{}>{})".format(kind, pattern) for kind, pattern in SECTION_PATTERNS.items()))
+
+# A resume section: its kind (a SECTION_PATTERNS key), the header as written,
+# and the stripped body with its character offsets in the resume text.
+Section = namedtuple("Section", ["kind", "header", "start", "end", "text"])
 
-    summary_regex = re.compile(summary_regex, re.IGNORECASE)
-    objective_regex = re.compile(objective_regex, re.IGNORECASE)
-    education_regex = re.compile(education_regex, re.IGNORECASE)
-    work_experience_regex = re.compile(work_experience_regex, re.IGNORECASE)
-    skills_regex = re.compile(r"(Skills|Technical Skills|Computer Skills|Technical skill-set)")
+def _make_section(kind, header, text, start, end):
+    body = text[start:end]
+    start += len(body) - len(body.lstrip())
+    end -= len(body) - len(body.rstrip())
+    return Section(kind, header, start, max(start, end), text[start:end])
 
+def segment_sections(text):
+    """
+    Splits the resume text into typed sections, in document order.
+    Text before the first header is returned as a 'Summary' section.
+    """
+    sections = []
     current_position = 0
-    current_header = 'Summary'
-    sections = {}
-
-    for match in re.finditer('|'.join([summary_regex.pattern, objective_regex.pattern,
-                                       education_regex.pattern, work_experience_regex.pattern,
-                                       skills_regex.pattern]), text):
-        section_text = text[current_position:match.start()].strip()
-        sections[current_header] = section_text
+    current_kind, current_header = 'summary', 'Summary'
+    for match in SECTION_REGEX.finditer(text):
+        sections.append(_make_section(current_kind, current_header, text, current_position, match.start()))
         current_position = match.end()
+        current_kind = next(kind for kind in SECTION_PATTERNS if match.group(kind) is not None)
         current_header = match.group(0)
-    section_text = text[current_position:].strip()
-    sections[current_header] = section_text
-    
+    sections.append(_make_section(current_kind, current_header, text, current_position, len(text)))
     return sections
 
-def get_skills_section(resume_text):
+def get_sections(text):
+    """
+    Splits the resume text into sections based on common header keywords.
+    Returns a dictionary where keys are the section headers.
+    """
+    return {section.header: section.text for section in segment_sections(text)}
+
+def get_section_text(resume_text, *kinds, sections=None):
+    """
+    Returns the text of every section of the given kinds, joined by newlines,
+    or an empty string if the resume has none.
+    """
+    if sections is None:
+        sections = segment_sections(resume_text)
+    return '\n'.join(section.text for section in sections if section.kind in kinds)
+
+def get_skills_section(resume_text, sections=None):
     """
     Retrieves and concatenates the text from the 'Skills' section(s) of the resume.
     """
-    sections = get_sections(resume_text)
-    skills_regex = re.compile(r"(?i)Skills|Technical Skills|Computer Skills|Technical skill-set")
-    skill_sections = []
-    for key in sections.keys():
-        if re.match(skills_regex, key):
-            skill_sections.append(sections[key])
-    return ' '.join(skill_sections)
+    return ' '.join(section.text for section in (sections or segment_sections(resume_text))
+                    if section.kind == 'skills')
+
+def get_org_text(resume_text, sections=None):
+    """
+    Returns the part of the resume the ORG model needs to read (education and
+    experience sections), or the whole text if neither section is present.
+    """
+    return get_section_text(resume_text, 'education', 'experience', sections=sections) or resume_text
+
+def _section_input(resume_text, doc, matches, sections, *kinds):
+    """
+    Restricts an extractor's input to the sections of the given kinds.
+
+    Returns (text, doc, matches): the section text plus, when the resume was
+    parsed, a Doc built from the matching spans of the shared parse (its
+    matcher hits are recomputed by the extractor). Falls back to the whole
+    resume when no such section exists.
+    """
+    found = [section for section in sections if section.kind in kinds and section.text]
+    if not found:
+        return resume_text, doc, matches
+    text = '\n'.join(section.text for section in found)
+    if doc is None:
+        return text, None, None
+    spans = [doc.char_span(section.start, section.end, alignment_mode="expand") for section in found]
+    spans = [span for span in spans if span is not None and len(span)]
+    if not spans:
+        return text, None, None
+    section_doc = Doc.from_docs([span.as_doc() for span in spans])
+    return section_doc.text, section_doc, None
 
 # -------------------------------------------------------
 # 3 - Main ML+Rule-Based NER Function
 # -------------------------------------------------------
 import time
+import itertools
+
+def _timed(timings, stage, func, *args, **kwargs):
+    """
+    Calls func and records its wall-clock time (seconds) under `stage`.
+    """
+    start = time.perf_counter()
+    with span("ner." + stage):
+        result = func(*args, **kwargs)
+    timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+    return result
+
+# Bump when extraction logic changes so cached records are not reused
+NER_VERSION = "2"
 
-def ner_ml_rule(file_name, resume_text):
-    start_time = time.time()
+# Fields of a result record, in the order ner_ml_rule returns them
+RESULT_FIELDS = ("file_name", "name", "phone_num", "email", "qualifications", "graduated_year",
+                 "location", "skills", "university", "company", "designation")
+
+def extract_resume_fields(file_name, resume_text, doc=None, matches=None, org_doc=None, org_model=None,
+                          timings=None, sections=None):
+    """
+    Runs every extractor over one resume and returns a result record (dict).
+
+    `doc`/`matches` are the shared parse of the whole text and `org_doc` the
+    ORG model's parse of get_org_text(resume_text); when they are None each
+    extractor parses its own input. Education and experience extractors only
+    read their own sections (or the whole resume if a section is missing).
+    Stage timings are added to `timings` if given, and the record's "scores"
+    and "timings" hold the skill scores and the per-stage seconds.
+    """
+    timings = {} if timings is None else timings
+    org_model = org_model or ORG_MODEL_NAME
+    if sections is None:
+        sections = _timed(timings, "sections", segment_sections, resume_text)
+    education_text, education_doc, education_matches = _section_input(resume_text, doc, matches, sections, 'education')
+    experience_text, experience_doc, _ = _section_input(resume_text, doc, matches, sections, 'experience')
+    if org_doc is None and doc is not None and org_model == MODEL_NAME:
+        _, org_doc, _ = _section_input(resume_text, doc, matches, sections, 'education', 'experience')
     
     # Extract entities using the defined functions
-    name = extract_names(resume_text)
-    phone_num = extract_mobile_number(resume_text)
-    email = extract_email(resume_text)
-    qualifications = extract_degree(resume_text)
-    graduated_year = extract_grad_years(resume_text)
-    location = extract_locations(resume_text)
+    name = _timed(timings, "names", extract_names, resume_text, doc=doc, matches=matches)
+    phone_num = _timed(timings, "mobile_number", extract_mobile_number, resume_text)
+    email = _timed(timings, "email", extract_email, resume_text)
+    qualifications = _timed(timings, "degree", extract_degree, education_text, doc=education_doc, matches=education_matches)
+    graduated_year = _timed(timings, "grad_years", extract_grad_years, education_text, doc=education_doc)
+    location = _timed(timings, "locations", extract_locations, resume_text, doc=doc)
     # Use resume_text directly instead of pdf_to_text(file_name)
-    skills, scores = get_skills_and_scores(get_skills_section(resume_text))
-    university = extract_organization(resume_text)
-    company = extract_company(resume_text)
-    designation = extract_designations(resume_text)
+    # get_skills_and_scores records its own sub-stages in the same timings
+    skills, scores = _timed(timings, "skills", lambda text: get_skills_and_scores(text, timings),
+                            get_skills_section(resume_text, sections))
+    organizations = _timed(timings, "organization", extract_organization, get_org_text(resume_text, sections),
+                           doc=org_doc, model_name=org_model)
+    company = _timed(timings, "company", extract_company, experience_text, orgs=organizations)
+    designation = _timed(timings, "designations", extract_designations, experience_text, doc=experience_doc)
     
     # Filter university names based on common keywords
     keywords = ["institution", "college", "university"]
-    university = [item for item in university if any(keyword in item.lower() for keyword in keywords)]
+    university = [item for item in organizations if any(keyword in item.lower() for keyword in keywords)]
     
-    # Print out the result
-    print("=================================== RESULT OF ML+Rule-BASED NER ===================================")
-    print("File Name: ", file_name)
-    print("Name: ", name)
-    print("\nPhone Number: ", phone_num)
-    print("\nEmail: ", set(email))
-    print("\nQualifications: ", qualifications)
-    print("\nGraduation Year: ", set(graduated_year))
-    print("\nLocation: ", set(location))
-    print("\nSkills: ", set(skills))
-    print("\nTotal Scores: ", sum(scores))
-    print("\nUniversity: ", university)
-    print("\nCompany: ", set(company))
-    print("\nDesignation: ", set(designation))
-    print("======================================== END OF RB+ML NER ========================================")
+    return {
+        "file_name": file_name,
+        "name": name,
+        "phone_num": phone_num,
+        "email": email,
+        "qualifications": qualifications,
+        "graduated_year": graduated_year,
+        "location": location,
+        "skills": skills,
+        "scores": scores,
+        "university": university,
+        "company": company,
+        "designation": designation,
+        "timings": timings,
+    }
+
+def extract_resume(file_name, resume_text, shared_doc=True, org_model=None, use_cache=True):
+    """
+    Runs every extractor over the resume text and returns the result record.
+
+    With `shared_doc` (the default) the text is parsed once with the main
+    model, and the ORG model only parses the education and experience
+    sections; every extractor reads from those Docs. Set it to False to let
+    each extractor parse its own input. `org_model` overrides ORG_MODEL_NAME;
+    when it is the main model, the main Doc is reused and no second parse
+    happens. With `use_cache`, a resume whose text was already extracted with
+    the same models is served from the result cache, and the record's
+    "cached" is True.
+    """
+    org_model = org_model or ORG_MODEL_NAME
+    timings = {}
+    cache_key = make_key("ner", resume_text, model="{}+{}".format(MODEL_NAME, org_model), prompt_version=NER_VERSION)
+    record = get_cache().get(cache_key) if use_cache else None
+    increment("ner_records", cached="true" if record is not None else "false")
     
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-    print("Execution time: {:.2f} seconds".format(elapsed_time))
+    if record is None:
+        sections = _timed(timings, "sections", segment_sections, resume_text)
+        if shared_doc:
+            doc, matches = _timed(timings, "parse", parse_resume, resume_text)
+            if org_model == MODEL_NAME:
+                org_doc = None
+            else:
+                org_doc = _timed(timings, "parse_org", get_model(org_model), get_org_text(resume_text, sections))
+        else:
+            doc, matches, org_doc = None, None, None
+        
+        record = extract_resume_fields(file_name, resume_text, doc=doc, matches=matches, org_doc=org_doc,
+                                       org_model=org_model, timings=timings, sections=sections)
+        record["cached"] = False
+        if use_cache:
+            get_cache().set(cache_key, record)
+        return record
+    return dict(record, file_name=file_name, timings={}, cached=True)
+
+def ner_ml_rule(file_name, resume_text, shared_doc=True, org_model=None, use_cache=True):
+    """
+    Runs every extractor over the resume text and returns the fields as a
+    tuple in RESULT_FIELDS order. The record, with its per-stage timings,
+    is written as an "ner_result" log event when instrumentation is on.
+    See extract_resume for the options.
+    """
+    with span("ner", file_name=file_name) as ner_span:
+        record = extract_resume(file_name, resume_text, shared_doc, org_model, use_cache)
+        ner_span.set(cached=record["cached"])
+    log_event("ner_result", **{field: record[field] for field in RESULT_FIELDS},
+              total_score=sum(record["scores"]), cached=record["cached"], timings=record["timings"])
+    return tuple(record[field] for field in RESULT_FIELDS)
+
+def ner_ml_rule_batch(resumes, batch_size=16, n_process=1, org_model=None):
+    """
+    Extracts many resumes at once and yields one result record per resume.
+
+    `resumes` is an iterable of (file_name, resume_text) pairs and is consumed
+    lazily. Texts are streamed through nlp.pipe (and the ORG model's pipe,
+    over the education and experience sections, unless it is the main model)
+    with the given `batch_size` and `n_process`, and records come out in input
+    order. The per-stage "timings" of a record only cover the extractors;
+    parsing is shared by the whole batch.
+    """
+    org_model = org_model or ORG_MODEL_NAME
+    stream = ((text, name) for name, text in resumes)
+    if org_model == MODEL_NAME:
+        org_docs = itertools.repeat(None)
+    else:
+        # Each pipe gets its own copy of the stream so both can run lazily
+        stream, org_stream = itertools.tee(stream)
+        org_docs = get_model(org_model).pipe((get_org_text(text) for text, _ in org_stream),
+                                             batch_size=batch_size, n_process=n_process)
+    docs = get_nlp().pipe(stream, as_tuples=True, batch_size=batch_size, n_process=n_process)
     
-    return file_name, name, phone_num, email, qualifications, graduated_year, location, skills, university, company, designation
+    for (doc, file_name), org_doc in zip(docs, org_docs):
+        yield extract_resume_fields(file_name, doc.text, doc=doc, matches=get_matcher()(doc),
+                                    org_doc=org_doc, org_model=org_model)
+
+def warm_up_tasks(org_model=None):
+    """
+    Returns {name: callable} loading everything extraction needs, for
+    warmup.WarmUp to run in the background before the first resume arrives.
+    """
+    org_model = org_model or ORG_MODEL_NAME
+    tasks = {
+        # Running a tiny text also initialises lazily created components
+        "ner model": lambda: get_matcher()(get_nlp()("warm up")),
+        "skill index": lambda: get_skill_index(get_nlp(), SKILL_SET_PATH),
+        "gazetteers": lambda: [get_gazetteer(path) for path in (COMPANY_PATH, JOB_TITLES_PATH)],
+        "skillner": get_skill_extractor,
+        "stopwords": get_stopword_set,
+    }
+    if org_model != MODEL_NAME:
+        tasks["org model"] = lambda: get_model(org_model)("warm up")
+    return tasks
+
+def __getattr__(name):
+    # ner_module.nlp / .matcher / .stop still work, loading on first access
+    if name == "nlp":
+        return get_nlp()
+    if name == "matcher":
+        return get_matcher()
+    if name == "stop":
+        return get_stopwords()
+    if name in ("SKILL_DB", "SkillExtractor"):
+        return load_skillner()[name == "SkillExtractor"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
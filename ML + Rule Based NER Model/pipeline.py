@@ -0,0 +1,258 @@
+# pipeline.py
+"""
+Headless resume pipeline: text extraction -> NER -> skill cleaning ->
+recommendations -> ATS scoring, without a Streamlit session.
+
+    python pipeline.py batch resumes/ --jd job.txt --output results.jsonl
+    python pipeline.py serve --port 8080
+"""
+import os
+import sys
+import json
+import time
+import base64
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import text_extraction
+import ner_module
+from skill_normaliser import clean_skills
+import recommendation
+import instrumentation
+from scoring_client import ScoringClient, RESUME_PROMPT
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+DEFAULT_MAX_PAGES = 10
+
+_scoring_client = None
+_scoring_lock = threading.Lock()
+
+def _json_default(value):
+    # numpy scalars in the skill scores
+    return value.item() if hasattr(value, "item") else str(value)
+
+def get_scoring_client():
+    global _scoring_client
+    if _scoring_client is None:
+        with _scoring_lock:
+            if _scoring_client is None:
+                _scoring_client = ScoringClient()
+    return _scoring_client
+
+def process_resume(name, text, job_desc=None, clean=True, score=True, semantic=None):
+    """
+    Runs the pipeline stages on one resume's text and returns a JSON-ready
+    result. A failing stage is recorded under "errors" and later stages
+    that depend on it are skipped; independent stages still run.
+    """
+    result = {"file_name": name, "errors": {}, "timings": {}}
+
+    def stage(stage_name, func, *args):
+        start = time.perf_counter()
+        try:
+            with instrumentation.span("pipeline." + stage_name):
+                return func(*args)
+        except Exception as e:
+            result["errors"][stage_name] = f"{type(e).__name__}: {e}"
+            instrumentation.increment("pipeline_stage_errors", stage=stage_name)
+            return None
+        finally:
+            result["timings"][stage_name] = time.perf_counter() - start
+
+    record = stage("ner", ner_module.extract_resume, name, text)
+    if record is not None:
+        result["ner"] = {key: value for key, value in record.items() if key not in ("file_name", "timings")}
+        skills = record["skills"]
+        if clean and skills:
+            cleaned = stage("clean", clean_skills, ", ".join(skills))
+            if cleaned is not None:
+                skills = [skill.strip() for skill in cleaned.split(",") if skill.strip()]
+        result["skills"] = skills
+
+        if job_desc:
+            recommendations = stage("recommend", recommendation.get_recommendations, job_desc, ", ".join(skills),
+                                    clean, semantic)
+            if recommendations is not None:
+                result["missing_skills"], result["courses"] = recommendations
+
+    if job_desc and score:
+        scores = stage("score", get_scoring_client().score, RESUME_PROMPT, [text, job_desc])
+        if scores is not None:
+            result["scores"] = scores
+    return result
+
+def process_file(path, job_desc=None, max_pages=DEFAULT_MAX_PAGES, **options):
+    """
+    Extracts the text of a resume file and runs process_resume on it.
+    """
+    name = os.path.basename(path)
+    start = time.perf_counter()
+    try:
+        text = text_extraction.extract_text(path, max_pages=max_pages)
+    except Exception as e:
+        instrumentation.increment("pipeline_stage_errors", stage="extract")
+        return {"file_name": name, "errors": {"extract": f"{type(e).__name__}: {e}"},
+                "timings": {"extract": time.perf_counter() - start}}
+    seconds = time.perf_counter() - start
+    result = process_resume(name, text, job_desc, **options)
+    result["timings"]["extract"] = seconds
+    return result
+
+def iter_resume_paths(directory):
+    """
+    Yields the supported resume files under a directory, in sorted order.
+    """
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file_name in sorted(files):
+            if file_name.lower().endswith(SUPPORTED_EXTENSIONS):
+                yield os.path.join(root, file_name)
+
+def run_batch(paths, output, job_desc=None, workers=4, max_pending=None, **options):
+    """
+    Processes resume files on a pool of `workers` threads and writes one
+    JSON line per resume to `output` as results complete.
+
+    At most `max_pending` files (default 2 x workers) are queued or running
+    at any time; reading further paths waits until a result is written, so
+    memory stays bounded however many files there are. Returns the number
+    of records written.
+    """
+    max_pending = max_pending or 2 * workers
+    written = 0
+    pending = set()
+
+    def write(done):
+        for future in done:
+            output.write(json.dumps(future.result(), default=_json_default) + "\n")
+        output.flush()
+        return len(done)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pipeline") as executor:
+        for path in paths:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                written += write(done)
+            pending.add(executor.submit(process_file, path, job_desc, **options))
+        written += write(wait(pending).done)
+    return written
+
+def make_handler(workers, options):
+    """
+    Returns a request handler class for the HTTP service. At most `workers`
+    requests are processed at once; further ones get 503 with Retry-After.
+    """
+    slots = threading.BoundedSemaphore(workers)
+
+    class PipelineHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "metrics": instrumentation.snapshot()})
+            elif self.path == "/metrics":
+                data = instrumentation.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            """
+            POST /analyze with a JSON body: {"name", "text" or "file_base64",
+            "job_description"}; returns the process_resume result.
+            """
+            if self.path != "/analyze":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send(400, {"error": "invalid JSON body"})
+                return
+            if not slots.acquire(blocking=False):
+                self._send(503, {"error": "busy, retry later"}, {"Retry-After": "1"})
+                return
+            try:
+                name = body.get("name", "resume")
+                if "file_base64" in body:
+                    text = text_extraction.extract_text(base64.b64decode(body["file_base64"]), filename=name,
+                                                        max_pages=options.get("max_pages", DEFAULT_MAX_PAGES))
+                else:
+                    text = body.get("text", "")
+                result = process_resume(name, text, body.get("job_description"),
+                                        clean=options.get("clean", True), score=options.get("score", True),
+                                        semantic=options.get("semantic"))
+                self._send(200, result)
+            except Exception as e:
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+            finally:
+                slots.release()
+
+        def _send(self, status, payload, headers=None):
+            data = json.dumps(payload, default=_json_default).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+    return PipelineHandler
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless resume pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="process a directory of resumes into JSONL")
+    batch.add_argument("directory")
+    batch.add_argument("--jd", help="file with the job description to match against")
+    batch.add_argument("--output", default="-", help="JSONL output file (default: stdout)")
+    batch.add_argument("--max-pending", type=int, help="files queued at once (default: 2 x workers)")
+
+    serve = commands.add_parser("serve", help="run a local HTTP service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--no-metrics", action="store_true", help="don't record spans and counters for /metrics")
+
+    for command in (batch, serve):
+        command.add_argument("--workers", type=int, default=4)
+        command.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES)
+        command.add_argument("--no-clean", action="store_true", help="skip skill cleaning, including the recommendations' (no Groq calls)")
+        command.add_argument("--no-score", action="store_true", help="skip Gemini scoring")
+        command.add_argument("--exact-skills", action="store_true",
+                             help="count a required skill as present only under its own name (default: SKILL_SEMANTIC_MATCH)")
+
+    args = parser.parse_args(argv)
+    if args.max_pages < 1:
+        parser.error("--max-pages must be at least 1")
+    options = {"max_pages": args.max_pages, "clean": not args.no_clean, "score": not args.no_score,
+               "semantic": False if args.exact_skills else None}
+
+    if args.command == "batch":
+        job_desc = None
+        if args.jd:
+            with open(args.jd, "r", encoding="utf-8") as f:
+                job_desc = f.read()
+        output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            count = run_batch(iter_resume_paths(args.directory), output, job_desc,
+                              workers=args.workers, max_pending=args.max_pending, **options)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        print(f"Processed {count} resumes", file=sys.stderr)
+    else:
+        if not args.no_metrics:
+            instrumentation.enable()
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(args.workers, options))
+        print(f"Serving on http://{args.host}:{args.port}", file=sys.stderr)
+        server.serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -1,86 +1,209 @@
 # recommendation.py
-import pandas as pd
 import os
-import requests
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from dotenv import load_dotenv
+import numpy as np
 from functools import lru_cache
-from concurrent.futures import ThreadPoolExecutor
-from cleaning_module import clean_text_with_groq
+from scipy.sparse import csr_matrix
+from skill_normaliser import clean_skills, get_skill_normaliser
+from course_catalogue import get_course_catalogue
+from instrumentation import warning
 
-# Load environment variables once
-load_dotenv()
-API_KEY = os.getenv("API_KEY")
+# Role catalogue and its prebuilt index (see role_index.py for the build step)
+CATALOGUE_PATH = "skill_set.csv"
+ROLE_INDEX_DIR = "role_index"
+SKILL_VECTORS_DIR = "skill_vectors"
 
-# Precompute TF-IDF components during module load
 @lru_cache(maxsize=1)
-def load_data(filepath="skill_set.csv"):
-    """Load and cache role-skill dataset with preprocessing"""
-    df = pd.read_csv(filepath)
-    df['Skills_Processed'] = df['skills'].str.lower().str.replace(r'[^\w\s]', '', regex=True)
-    return df
+def get_role_index():
+    """Load the role index on first use, rebuilding it if the catalogue changed"""
+    # Imported here so scikit-learn is only loaded once the index is needed
+    from role_index import load_role_index
+    return load_role_index(CATALOGUE_PATH, ROLE_INDEX_DIR)
 
-# Initialize TF-IDF components once
-df = load_data()
-vectorizer = TfidfVectorizer(stop_words='english')
-tfidf_matrix = vectorizer.fit_transform(df['Skills_Processed'])
+@lru_cache(maxsize=1)
+def get_skill_vectors():
+    """
+    Load the catalogue skill vectors on first use (see skill_vectors.py),
+    or None if the vector model is not installed
+    """
+    from skill_vectors import load_skill_vectors
+    try:
+        return load_skill_vectors(CATALOGUE_PATH, SKILL_VECTORS_DIR)
+    except (OSError, ImportError) as e:
+        warning(f"Skill vectors unavailable, matching skills exactly: {e}", error=str(e))
+        return None
+
+# Roles considered per job description, and the similarity (relative to the
+# best role's) of the roles requiring a skill it needs to count as required;
+# the best role's skills always do
+TOP_K_ROLES = 3
+MIN_SKILL_WEIGHT = 0.34
+# Whether a user skill also covers the required skills it is another name
+# of: an alias or acronym ("ML" for "machine learning"), see
+# SkillNormaliser.covered. Checked against the labelled skill_pairs.csv
+SEMANTIC_MATCH = os.getenv("SKILL_SEMANTIC_MATCH", "1").lower() not in ("0", "false", "no")
+# Cosine similarity of word vectors at which a user skill covers a required
+# one as well ("JS", "javascript"). Off unless set; calibrate it on
+# skill_pairs.csv with `python skill_vectors.py calibrate` first
+SKILL_SIMILARITY = float(os.environ["SKILL_VECTOR_SIMILARITY"]) if os.getenv("SKILL_VECTOR_SIMILARITY") else None
+
+def parse_skill_list(user_skills):
+    """Lower-cased set of the items of a comma-separated skill string"""
+    return {s.strip().lower() for s in user_skills.split(',') if s.strip()}
+
+def written_skill_list(user_skills):
+    """The distinct items of a comma-separated skill string, as written"""
+    return list({s.strip().lower(): s.strip() for s in user_skills.split(',') if s.strip()}.values())
 
-def recommend_missing_skills(job_description, user_skills):
-    """Optimized skill gap analysis using precomputed TF-IDF"""
-    # Clean inputs
-    cleaned_jd = ' '.join(job_description.lower().split())
-    user_skills_lower = [s.strip().lower() for s in user_skills.split(',')]
+def required_skill_weights(role_index, matches):
+    """
+    Returns {skill_lower: (skill, weight)} for the skills of the matched
+    roles. A skill's weight is the similarity of the roles requiring it over
+    that of the best role, so the best role's skills weigh at least 1 and
+    near-tied roles weigh about the same.
+    """
+    best = max((score for _, score in matches), default=0.0)
+    if best <= 0:
+        # Nothing matches: fall back to the single best-ranked role
+        matches, best = [(row, 1.0) for row, _ in matches[:1]], 1.0
     
-    # Transform job description
-    jd_vector = vectorizer.transform([cleaned_jd])
+    weights = {}
+    for row, score in matches:
+        for skill in role_index.role_skills[row]:
+            key = skill.lower()
+            name, weight = weights.get(key, (skill, 0.0))
+            weights[key] = (name, weight + score / best)
+    return weights
+
+def skills_covered(skills, user_skills, threshold=None):
+    """
+    Returns, for each required skill, whether one of `user_skills` names it:
+    as an alias or acronym or, with a vector `threshold` (SKILL_SIMILARITY by
+    default), through a word vector at least that similar. All skills left
+    are compared to all user skills in one matrix product.
+    """
+    covered = get_skill_normaliser().covered(skills, user_skills)
+    threshold = SKILL_SIMILARITY if threshold is None else threshold
+    if threshold is not None and not covered.all():
+        skill_vectors = get_skill_vectors()
+        if skill_vectors is not None:
+            covered |= skill_vectors.covered(skills, user_skills, threshold)
+    return covered
+
+def weighted_missing_skills(job_description, user_skills, k=TOP_K_ROLES, semantic=None, threshold=None):
+    """
+    Returns (skill, weight) pairs for the skills of the k roles closest to
+    the job description that the user lacks, best first.
+
+    With `semantic` (SEMANTIC_MATCH by default), a required skill is also
+    covered by another name of it, see skills_covered.
+    """
+    user_skills_lower = parse_skill_list(user_skills)
+    role_index = get_role_index()
+    weights = required_skill_weights(role_index, role_index.top_k(job_description, k))
+    missing = [item for key, item in weights.items() if key not in user_skills_lower]
+    if (SEMANTIC_MATCH if semantic is None else semantic) and missing and user_skills_lower:
+        # As written, since word vectors are case-sensitive ("ML", "AWS")
+        written = written_skill_list(user_skills)
+        covered = skills_covered([skill for skill, _ in missing], written, threshold)
+        missing = [item for item, is_covered in zip(missing, covered) if not is_covered]
+    return sorted(missing, key=lambda item: -item[1])
+
+def recommend_missing_skills(job_description, user_skills, k=TOP_K_ROLES, min_weight=MIN_SKILL_WEIGHT,
+                             semantic=None):
+    """Skill gap analysis against the k closest roles in the role index"""
+    return [skill for skill, weight in weighted_missing_skills(job_description, user_skills, k, semantic)
+            if weight >= min_weight]
+
+def match_matrix(job_descs, skill_sets, k=TOP_K_ROLES, min_weight=MIN_SKILL_WEIGHT, semantic=None):
+    """
+    Matches N job descriptions against M candidates in one call.
+
+    `skill_sets` holds one comma-separated skill string per candidate.
+    Returns a dict with:
+      - "scores": N x M cosine similarity of each JD to each candidate's skills
+      - "coverage": N x M share of each JD's required skills the candidate has
+      - "missing": missing[i][j], the JD i skills candidate j lacks, by weight
+    Required skills come from the k closest roles and are matched as in
+    recommend_missing_skills.
+    """
+    job_descs, skill_sets = list(job_descs), list(skill_sets)
+    if not job_descs or not skill_sets:
+        return {"scores": np.zeros((len(job_descs), len(skill_sets))),
+                "coverage": np.zeros((len(job_descs), len(skill_sets))),
+                "missing": [[[] for _ in skill_sets] for _ in job_descs]}
+    role_index = get_role_index()
     
-    # Find best match
-    cosine_sim = cosine_similarity(jd_vector, tfidf_matrix)
-    best_match_idx = cosine_sim.argmax()
+    # One sparse product for all JD x candidate scores
+    jd_vectors = role_index.transform(job_descs)
+    candidate_vectors = role_index.transform([skills.replace(',', ' ') for skills in skill_sets])
+    scores = (jd_vectors @ candidate_vectors.T).toarray()
     
-    # Identify missing skills
-    required_skills = df.iloc[best_match_idx]['skills'].split(', ')
-    return [skill for skill in required_skills if skill.lower() not in user_skills_lower]
-
-def search_courses_batch(skills, max_results=2, timeout=3):
-    """Parallel YouTube search with timeout handling"""
-    def fetch_single(skill):
-        try:
-            query = f"{skill.strip()} full course" if "course" not in skill.lower() else skill
-            url = (
-                f"https://www.googleapis.com/youtube/v3/search?"
-                f"part=snippet&q={query}&type=video&key={API_KEY}"
-                f"&maxResults={max_results}&videoDuration=long"
-            )
-            response = requests.get(url, timeout=timeout).json()
-            return [
-                (item['snippet']['title'],
-                f"https://www.youtube.com/watch?v={item['id']['videoId']}")
-                for item in response.get('items', [])
-            ]
-        except Exception as e:
-            print(f"Error searching {skill}: {str(e)[:50]}")
-            return []
+    # Required skills per JD, with all JDs ranked against the roles at once
+    required = []
+    for matches in role_index.top_k_batch(job_descs, k):
+        weights = required_skill_weights(role_index, matches)
+        items = sorted((item for item in weights.items() if item[1][1] >= min_weight), key=lambda item: -item[1][1])
+        required.append(items)
+    
+    # Binary candidate x skill matrix over the required-skill vocabulary
+    columns = {}
+    for items in required:
+        for key, (name, _) in items:
+            columns.setdefault(key, name)
+    columns = {key: (column, name) for column, (key, name) in enumerate(columns.items())}
+    rows, cols = [], []
+    for j, skills in enumerate(skill_sets):
+        for key in parse_skill_list(skills):
+            if key in columns:
+                rows.append(j)
+                cols.append(columns[key][0])
+    has_skill = csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)),
+                           shape=(len(skill_sets), len(columns))).toarray().astype(bool)
+    if (SEMANTIC_MATCH if semantic is None else semantic) and columns:
+        names = [name for _, name in columns.values()]
+        for j, skills in enumerate(skill_sets):
+            written = written_skill_list(skills)
+            if written and not has_skill[j].all():
+                has_skill[j] |= skills_covered(names, written)
+    
+    coverage = np.zeros((len(job_descs), len(skill_sets)))
+    missing = []
+    for i, items in enumerate(required):
+        if not items:
+            coverage[i] = 1.0
+            missing.append([[] for _ in skill_sets])
+            continue
+        present = has_skill[:, [columns[key][0] for key, _ in items]]  # M x required
+        coverage[i] = present.mean(axis=1)
+        names = [name for _, (name, _) in items]
+        missing.append([[name for name, found in zip(names, row) if not found] for row in present])
+    return {"scores": scores, "coverage": coverage, "missing": missing}
 
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        return {skill: results for skill, results in zip(
-            skills,
-            executor.map(fetch_single, skills))
-        }
+def search_courses_batch(skills):
+    """
+    Course lookup for many skills through the shared course catalogue,
+    whose settings decide the courses per skill and the request timeout
+    """
+    return get_course_catalogue().lookup_many(skills)
 
-def get_recommendations(job_desc, user_skills):
-    """Optimized recommendation pipeline with batch processing"""
+def get_recommendations(job_desc, user_skills, clean=True, semantic=None):
+    """
+    Optimized recommendation pipeline with batch processing. With `clean`
+    False the missing skills are used as listed in the catalogue, without
+    the cleaning step (and its LLM calls); `semantic` is passed to
+    recommend_missing_skills.
+    """
     # Get missing skills
-    missing_skills = recommend_missing_skills(job_desc, user_skills)
+    missing_skills = recommend_missing_skills(job_desc, user_skills, semantic=semantic)
+    if not missing_skills:
+        return [], {}
     
-    # Batch clean missing skills
-    if missing_skills:
-        raw_skills = ", ".join(missing_skills)
-        cleaned_text = clean_text_with_groq(raw_skills)
+    # Batch clean missing skills (locally; only unknown ones go to the LLM)
+    if clean:
+        cleaned_text = clean_skills(", ".join(missing_skills))
         cleaned_skills = [s.strip() for s in cleaned_text.split(",") if s.strip()]
     else:
-        return [], {}
+        cleaned_skills = missing_skills
     
     # Parallel course search
     recommendations = search_courses_batch(cleaned_skills)
@@ -0,0 +1,166 @@
+# result_cache.py
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from instrumentation import register_collector
+
+# Set RESULT_CACHE_PATH to move the on-disk cache, or to an empty string to
+# keep results in memory only
+CACHE_PATH = os.getenv(
+    "RESULT_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".result_cache.sqlite3")
+)
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+
+def make_key(namespace, text, model="", prompt_version=""):
+    """
+    Returns the cache key of a stage result: a SHA-256 over the stage name,
+    the input text, the model and the prompt (or prompt version) used.
+    """
+    digest = hashlib.sha256()
+    for part in (namespace, model, prompt_version, text):
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return "{}:{}".format(namespace, digest.hexdigest())
+
+class ResultCache:
+    """
+    Two-level cache for JSON-serialisable results: an in-memory LRU in front
+    of a SQLite table. Entries expire after `ttl` seconds; each level keeps
+    at most its configured number of entries, dropping the least recently
+    used ones first. Both levels hold the JSON text, so every hit returns a
+    new object that callers may modify.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_memory_items=256, max_disk_items=10000, ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl = ttl
+        self.memory = OrderedDict()  # key -> (created, JSON text)
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self.lock = threading.Lock()
+        self.connection = None
+        if path:
+            self.connection = sqlite3.connect(path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self.connection.commit()
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for `key`, or `default` if it is missing or expired.
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self.memory.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return json.loads(entry[1])
+                del self.memory[key]
+            if self.connection is not None:
+                row = self.connection.execute(
+                    "SELECT value, created FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    self.connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+                    self.connection.commit()
+                    self._remember(key, row[1], row[0])
+                    self.counters["disk_hits"] += 1
+                    return json.loads(row[0])
+            self.counters["misses"] += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Stores a JSON-serialisable value under `key` in both levels.
+        """
+        now = time.time()
+        data = json.dumps(value)
+        with self.lock:
+            self._remember(key, now, data)
+            self.counters["writes"] += 1
+            if self.connection is not None:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO results (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    (key, data, now, now)
+                )
+                self._evict_disk(now)
+                self.connection.commit()
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for `key`, calling `compute()` and storing
+        its result on a miss. None results are not cached.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the current size of each level.
+        """
+        with self.lock:
+            stats = dict(self.counters)
+            stats["memory_items"] = len(self.memory)
+            if self.connection is not None:
+                stats["disk_items"] = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """
+        Removes every entry from both levels.
+        """
+        with self.lock:
+            self.memory.clear()
+            if self.connection is not None:
+                self.connection.execute("DELETE FROM results")
+                self.connection.commit()
+
+    def _remember(self, key, created, data):
+        self.memory[key] = (created, data)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_items:
+            self.memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def _evict_disk(self, now):
+        expired = self.connection.execute("DELETE FROM results WHERE created <= ?", (now - self.ttl,)).rowcount
+        overflow = self.connection.execute(
+            "DELETE FROM results WHERE key IN "
+            "(SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_items,)
+        ).rowcount
+        self.counters["evictions"] += expired + overflow
+
+# Process-wide cache shared by every stage
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """
+    Returns the shared ResultCache, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache()
+                register_collector("result_cache", _cache.stats)
+    return _cache
@@ -0,0 +1,225 @@
+# role_index.py
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from instrumentation import warning
+
+# Bump when the stored layout or the vectorizer settings change
+FORMAT_VERSION = 2
+STOP_WORDS = 'english'
+
+def split_skills(skills):
+    """
+    Splits a catalogue "skills" cell ("python, sql, ...") into a list.
+    """
+    return [skill.strip() for skill in skills.split(',') if skill.strip()]
+
+class RoleIndex:
+    """
+    Nearest-neighbour index over the role catalogue.
+
+    Each role is a TF-IDF row of its skills; the vectorizer L2-normalises
+    rows, so the sparse product of the matrix with a query vector gives the
+    cosine similarity to every role without densifying anything.
+    """
+
+    def __init__(self, vectorizer, matrix, role_skills, role_names):
+        self.vectorizer = vectorizer
+        self.matrix = matrix.tocsr()
+        self.role_skills = role_skills  # list of skill lists, one per role
+        self.role_names = role_names
+
+    @classmethod
+    def build(cls, df):
+        """
+        Fits the index on a catalogue DataFrame with a "skills" column and,
+        optionally, a "role" column.
+        """
+        vectorizer = TfidfVectorizer(stop_words=STOP_WORDS)
+        matrix = vectorizer.fit_transform(df['skills'].str.lower().str.replace(r'[^\w\s]', '', regex=True))
+        role_skills = [split_skills(skills) for skills in df['skills']]
+        if 'role' in df.columns:
+            role_names = df['role'].astype(str).tolist()
+        else:
+            role_names = [str(i) for i in range(len(df))]
+        return cls(vectorizer, matrix, role_skills, role_names)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def transform(self, texts):
+        """
+        Returns the L2-normalised TF-IDF rows (sparse) of the texts.
+        """
+        return self.vectorizer.transform([' '.join(text.lower().split()) for text in texts])
+
+    def scores(self, text):
+        """
+        Returns the cosine similarity of the text to every role.
+        """
+        return (self.matrix @ self.transform([text]).T).toarray().ravel()
+
+    def top_k(self, text, k=3):
+        """
+        Returns up to k (role_row, score) pairs, best first.
+        """
+        return self.top_k_batch([text], k)[0]
+
+    def top_k_batch(self, texts, k=3):
+        """
+        Returns, for each text, up to k (role_row, score) pairs, best first.
+        All texts are scored with one sparse matrix product.
+        """
+        scores = (self.transform(texts) @ self.matrix.T).toarray()
+        k = min(k, scores.shape[1])
+        if k <= 0:
+            return [[] for _ in texts]
+        rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, rows, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        rows = np.take_along_axis(rows, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [[(int(row), float(score)) for row, score in zip(row_ids, row_scores)]
+                for row_ids, row_scores in zip(rows, top_scores)]
+
+    def save(self, index_dir, source_hash):
+        """
+        Writes the index to `index_dir`: the vocabulary, roles and source hash
+        in meta.json, and the IDF weights and CSR arrays as raw .npy files.
+        """
+        arrays = {"idf": self.vectorizer.idf_, "data": self.matrix.data,
+                  "indices": self.matrix.indices, "indptr": self.matrix.indptr}
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "source_hash": source_hash,
+            "shape": list(self.matrix.shape),
+            "vocabulary": {term: int(column) for term, column in self.vectorizer.vocabulary_.items()},
+            "role_skills": self.role_skills,
+            "role_names": self.role_names,
+        }
+        save_arrays(index_dir, arrays, meta, source_hash[:16])
+
+    @classmethod
+    def load(cls, index_dir, mmap=True):
+        """
+        Loads an index written by save(). The matrix arrays are memory-mapped
+        unless `mmap` is False, so workers share them through the page cache.
+        """
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = load_arrays(index_dir, meta, mmap)
+        matrix = csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]),
+                            shape=tuple(meta["shape"]), copy=False)
+
+        vectorizer = TfidfVectorizer(stop_words=STOP_WORDS, vocabulary=meta["vocabulary"])
+        vectorizer.idf_ = np.array(arrays["idf"])
+        return cls(vectorizer, matrix, meta["role_skills"], meta["role_names"])
+
+def write_atomic(path, write):
+    """
+    Calls write(file) on a temporary file next to `path`, then renames it
+    over `path`, so readers never see a partly written file and processes
+    that memory-mapped the old file keep reading the old data.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def save_arrays(index_dir, arrays, meta, version):
+    """
+    Stores {name: array} and `meta` in `index_dir`.
+
+    Array files are named after `version` (derived from the source) and
+    meta.json, which lists them, is replaced last, so a rebuild never
+    rewrites a file another process has memory-mapped, and concurrent
+    rebuilds of the same source write identical files. Array files of other
+    versions are removed afterwards; open memory maps keep their data.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    files = {name: "{}-{}.npy".format(name, version) for name in arrays}
+    for name, array in arrays.items():
+        write_atomic(os.path.join(index_dir, files[name]), lambda f: np.save(f, array))
+    meta = dict(meta, arrays=files)
+    write_atomic(os.path.join(index_dir, "meta.json"), lambda f: f.write(json.dumps(meta).encode("utf-8")))
+    for entry in os.listdir(index_dir):
+        if entry.endswith(".npy") and entry not in files.values():
+            try:
+                os.remove(os.path.join(index_dir, entry))
+            except OSError:
+                pass  # Still mapped on Windows; removed by a later rebuild
+
+def load_arrays(index_dir, meta, mmap=True):
+    """
+    Returns {name: array} of the files listed in meta, memory-mapped unless
+    `mmap` is False.
+    """
+    return {name: np.load(os.path.join(index_dir, file_name), mmap_mode="r" if mmap else None)
+            for name, file_name in meta["arrays"].items()}
+
+def read_meta(index_dir):
+    """
+    Returns the stored meta.json of an index, or None if there is none.
+    """
+    try:
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def source_hash(csv_path):
+    """
+    Returns the SHA-256 hex digest of the catalogue CSV.
+    """
+    with open(csv_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def build_role_index(csv_path, index_dir):
+    """
+    Fits the index on the catalogue CSV and stores it in `index_dir`.
+    """
+    digest = source_hash(csv_path)
+    index = RoleIndex.build(pd.read_csv(csv_path))
+    index.save(index_dir, digest)
+    return index
+
+def load_role_index(csv_path, index_dir):
+    """
+    Loads the stored index if it was built from the current CSV (same
+    content hash and format version), rebuilding and storing it otherwise.
+    A stored index is also used when the CSV itself is missing.
+    """
+    meta = read_meta(index_dir)
+    current = meta is not None and meta.get("format_version") == FORMAT_VERSION
+    if not os.path.exists(csv_path):
+        if current:
+            return RoleIndex.load(index_dir)
+        raise FileNotFoundError("Role catalogue {} not found and no index in {}".format(csv_path, index_dir))
+    if current and meta.get("source_hash") == source_hash(csv_path):
+        try:
+            return RoleIndex.load(index_dir)
+        except FileNotFoundError:
+            pass  # Replaced by a concurrent rebuild from another catalogue
+    try:
+        return build_role_index(csv_path, index_dir)
+    except OSError as e:
+        # Read-only deployments can still serve from an in-memory index
+        warning(f"Could not store role index in {index_dir}: {e}", error=str(e))
+        return RoleIndex.build(pd.read_csv(csv_path))
+
+if __name__ == '__main__':
+    # Build step: python role_index.py [skill_set.csv] [role_index]
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "skill_set.csv"
+    index_dir = sys.argv[2] if len(sys.argv) > 2 else "role_index"
+    index = build_role_index(csv_path, index_dir)
+    print(f"Stored {len(index)} roles and {len(index.vectorizer.vocabulary_)} terms in {index_dir}")
@@ -0,0 +1,180 @@
+# scoring_client.py
+import re
+import json
+import time
+from collections import deque
+from typing import TypedDict
+import google.generativeai as genai
+from result_cache import get_cache, make_key
+from instrumentation import span, increment
+
+# The six resume scores, in display order
+SCORE_FIELDS = ("ats", "readability", "grammar", "keywords", "experience", "customization")
+SCORE_LABELS = {
+    "ats": "ATS Score",
+    "readability": "Readability",
+    "grammar": "Grammar",
+    "keywords": "Keywords",
+    "experience": "Experience",
+    "customization": "Customization",
+}
+
+class AtsScores(TypedDict):
+    """Response schema passed to Gemini; every score is a percentage (0-100)."""
+    ats: int
+    readability: int
+    grammar: int
+    keywords: int
+    experience: int
+    customization: int
+
+JSON_INSTRUCTIONS = (
+    "Respond ONLY with a JSON object with the integer keys "
+    + ", ".join(f'"{field}"' for field in SCORE_FIELDS)
+    + ", each a percentage from 0 to 100."
+)
+
+# Prompt for scoring a resume's text against a job description
+RESUME_PROMPT = """
+Analyze this resume and job description to provide these 6 scores:
+1. ATS Score: Match between resume and job description (0-100%)
+2. Readability: Resume clarity and structure (0-100%)
+3. Grammar: Spelling and grammar correctness (0-100%)
+4. Keywords: Industry-specific keyword usage (0-100%)
+5. Experience: Relevance of experience (0-100%)
+6. Customization: Tailoring to this specific job (0-100%)
+
+Use the JSON keys {} for these scores, in this order.
+""".format(", ".join(SCORE_FIELDS))
+
+# Bump when JSON_INSTRUCTIONS or validation change so cached scores are not reused
+SCHEMA_VERSION = "1"
+
+class ScoringError(Exception):
+    """Raised when the model fails or its reply cannot be turned into valid scores."""
+
+def parse_json(text):
+    """
+    Returns the JSON object in a reply, tolerating code fences or text
+    around it. Raises ValueError if there is none.
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        match = re.search(r"\{.*\}", text, re.DOTALL)
+        if match is None:
+            raise ValueError("no JSON object in reply")
+        return json.loads(match.group(0))
+
+def validate_scores(data):
+    """
+    Checks a parsed reply against the schema and returns {field: int}.
+    Raises ValueError describing every problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("reply is not a JSON object")
+    scores, problems = {}, []
+    for field in SCORE_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str):
+            value = value.strip().rstrip("%")
+            value = int(value) if value.isdigit() else None
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            problems.append(f"{field} missing or not a number")
+        elif not 0 <= value <= 100:
+            problems.append(f"{field} out of range: {value}")
+        else:
+            scores[field] = int(round(value))
+    if problems:
+        raise ValueError("; ".join(problems))
+    return scores
+
+def _cache_text(inputs):
+    # Text parts as is, image parts by their (base64) data
+    return "\0".join(part["data"] if isinstance(part, dict) else str(part) for part in inputs)
+
+class ScoringClient:
+    """
+    Gemini client for the six resume scores.
+
+    Requests JSON output constrained by the AtsScores schema, validates the
+    reply and, if it is still malformed, makes at most `max_repairs` cheap
+    text-only calls asking the model to fix its own output. Every call's
+    latency and token usage is recorded in `calls`, and validated scores are
+    cached by input, model and prompt.
+    """
+
+    def __init__(self, model_name="gemini-1.5-flash", max_repairs=1, use_cache=True, history=200):
+        self.model_name = model_name
+        self.max_repairs = max_repairs
+        self.use_cache = use_cache
+        self.model = genai.GenerativeModel(model_name)
+        self.calls = deque(maxlen=history)
+        self.generation_config = {
+            "response_mime_type": "application/json",
+            "response_schema": AtsScores,
+            "temperature": 0,
+        }
+
+    def score(self, prompt, inputs):
+        """
+        Returns {field: int} for the prompt and its inputs (text parts or
+        image parts such as {"mime_type": ..., "data": ...}).
+        Raises ScoringError if no valid reply is obtained.
+        """
+        if not self.use_cache:
+            return self._score(prompt, inputs)
+        cache_key = make_key("ats_scores_json", _cache_text(inputs), model=self.model_name,
+                             prompt_version=SCHEMA_VERSION + "\0" + prompt)
+        return get_cache().get_or_compute(cache_key, lambda: self._score(prompt, inputs))
+
+    def labelled(self, scores):
+        """
+        Returns the scores keyed by display label, as percentages.
+        """
+        return {SCORE_LABELS[field]: f"{scores[field]}%" for field in SCORE_FIELDS}
+
+    def _score(self, prompt, inputs):
+        text = self._generate("score", [prompt + "\n\n" + JSON_INSTRUCTIONS, *inputs])
+        for attempt in range(self.max_repairs + 1):
+            try:
+                return validate_scores(parse_json(text))
+            except ValueError as e:
+                increment("invalid_replies", service="gemini")
+                if attempt == self.max_repairs:
+                    raise ScoringError(f"Invalid scores from {self.model_name}: {e}")
+                # Only the bad reply is sent back, not the resume
+                text = self._generate("repair", [
+                    f"This reply was invalid ({e}):\n{text}\n\n"
+                    "Rewrite it as valid JSON, keeping the scores it contains. " + JSON_INSTRUCTIONS
+                ])
+
+    def _generate(self, stage, contents):
+        """
+        Returns the reply text. Raises ScoringError if the request fails or
+        the reply has no text (e.g. blocked or empty candidates).
+        """
+        start = time.perf_counter()
+        record = {"stage": stage, "model": self.model_name, "ok": False}
+        try:
+            with span("gemini", stage=stage, model=self.model_name):
+                response = self.model.generate_content(contents, generation_config=self.generation_config)
+        except Exception as e:
+            increment("external_call_failures", service="gemini")
+            raise ScoringError(f"Request to {self.model_name} failed: {e}") from e
+        else:
+            usage = getattr(response, "usage_metadata", None)
+            if usage is not None:
+                record["prompt_tokens"] = usage.prompt_token_count
+                record["output_tokens"] = usage.candidates_token_count
+            try:
+                # .text raises ValueError when no candidate has a text part
+                text = response.text
+            except ValueError as e:
+                increment("invalid_replies", service="gemini")
+                raise ScoringError(f"No usable reply from {self.model_name}: {e}") from e
+            record["ok"] = True
+            return text
+        finally:
+            record["latency"] = time.perf_counter() - start
+            self.calls.append(record)
@@ -0,0 +1,95 @@
+# skill_index.py
+import os
+import hashlib
+import threading
+from spacy.matcher import PhraseMatcher
+from spacy.util import filter_spans
+
+def file_hash(path):
+    """
+    Returns the SHA-1 hex digest of a file's contents.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def file_stat(path):
+    """
+    Returns a file's (mtime_ns, size), compared before re-hashing it.
+    """
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+class SkillIndex:
+    """
+    Token-boundary aware index over a skill corpus (one skill per line).
+
+    All skills are compiled into a single PhraseMatcher on lower-cased
+    tokens, so one pass over the tokenised text finds every skill, and short
+    skills such as "r" or "go" only match whole tokens.
+    """
+
+    def __init__(self, nlp, path):
+        self.path = path
+        self.hash = file_hash(path)
+        self.stat = file_stat(path)
+        self.nlp = nlp
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        # Match key -> skill as written in the corpus (first spelling wins)
+        self.skills_by_key = {}
+
+        with open(path, "r") as corpus_file:
+            corpus = [line.strip() for line in corpus_file.read().splitlines()]
+        patterns = {}
+        for skill in corpus:
+            key = skill.lower()
+            if skill and key not in self.skills_by_key:
+                self.skills_by_key[key] = skill
+                patterns[key] = skill
+        for key, pattern in zip(patterns, nlp.tokenizer.pipe(patterns.values())):
+            self.matcher.add(key, [pattern])
+
+    def find(self, text):
+        """
+        Returns (skill, start_char, end_char) for every skill occurrence in
+        the text, in text order, without overlaps. Offsets index into `text`
+        for highlighting.
+        """
+        doc = self.nlp.make_doc(text)
+        # Overlapping matches keep the longest: "C#" and "Objective-C" are
+        # not also "c"
+        spans = filter_spans(self.matcher(doc, as_spans=True))
+        return [(self.skills_by_key[span.label_], span.start_char, span.end_char) for span in spans]
+
+    def skills(self, text):
+        """
+        Returns the distinct skills found in the text, in order of first occurrence.
+        """
+        return list(dict.fromkeys(skill for skill, _, _ in self.find(text)))
+
+
+# Built indexes, keyed by absolute corpus path
+_indexes = {}
+_lock = threading.Lock()
+
+def get_skill_index(nlp, path="skill_set.txt"):
+    """
+    Returns the cached SkillIndex for `path`, rebuilding it when the file's
+    content hash changes. The hash is only recomputed when the file's mtime
+    or size differs from the cached index.
+    """
+    key = os.path.abspath(path)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None and index.nlp is nlp:
+            stat = file_stat(path)
+            if stat == index.stat:
+                return index
+            if file_hash(path) == index.hash:
+                index.stat = stat
+                return index
+        index = SkillIndex(nlp, path)
+        _indexes[key] = index
+        return index
@@ -0,0 +1,263 @@
+# skill_normaliser.py
+import os
+import re
+import threading
+from cleaning_module import clean_text_with_groq
+from instrumentation import span, increment, warning
+
+SKILL_SET_PATH = "skill_set.txt"
+# Cosine similarity a match needs to be trusted without asking the LLM
+CONFIDENCE_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.8"))
+# A fuzzy match must be about as long as the raw skill, so a skill is not
+# cut down to a name it contains ("java ee" -> "java")
+MIN_LENGTH_RATIO = 0.8
+# Words left out of a skill's initials ("enterprise resource planning" -> "erp")
+ACRONYM_STOP_WORDS = frozenset(("of", "and", "the", "for", "in", "on", "to", "with", "a", "an", "&"))
+
+def alias_key(skill):
+    """
+    Returns the key aliases share: lower-cased alphanumerics only, so
+    "Node JS", "node.js" and "nodejs" are the same skill.
+    """
+    return re.sub(r"[^0-9a-z+#]+", "", skill.lower())
+
+def initials(skill):
+    """
+    Returns the initials of a multi-word skill ("machine learning" -> "ml"),
+    or None for a single word. Hyphenated names ("python-mode") are one word.
+    """
+    words = [word for word in skill.lower().split() if word not in ACRONYM_STOP_WORDS]
+    if len(words) < 2 or not all(word[0].isalnum() for word in words):
+        return None
+    return "".join(word[0] for word in words)
+
+def display_name(skill):
+    """
+    Strips SkillNER's qualifiers: "Python (Programming Language)" -> "Python".
+    """
+    return re.sub(r"\s*\([^)]*\)\s*$", "", " ".join(skill.split())) or skill.strip()
+
+def skillner_entries():
+    """
+    Returns (canonical, [surface forms]) for each SKILL_DB skill, or [] if
+    SkillNER is not installed.
+    """
+    try:
+        from skillNer.general_params import SKILL_DB
+    except ModuleNotFoundError:
+        return []
+    entries = []
+    for skill in SKILL_DB.values():
+        forms = list(skill.get("high_surfce_forms", {}).values()) + list(skill.get("low_surface_forms", []))
+        entries.append((display_name(skill["skill_name"]), forms))
+    return entries
+
+class SkillNormaliser:
+    """
+    Maps raw skill strings to canonical skills.
+
+    Every canonical name and alias is a row of a character n-gram TF-IDF
+    matrix (L2-normalised, computed once), so a batch of raw skills is
+    matched against all of them with one sparse product; n-grams make the
+    match tolerant to typos ("deep lerning") and spacing ("node js").
+    Exact alias keys are resolved first, without the matrix. A fuzzy match
+    whose length is under MIN_LENGTH_RATIO of the raw skill's (or the other
+    way round) gets confidence 0, so it goes to the LLM.
+    """
+
+    def __init__(self, entries):
+        # Imported here so importing the module (and recommendation, app)
+        # doesn't load scikit-learn before a normaliser is built
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        # entries: (canonical, aliases) pairs; earlier entries win alias clashes
+        self.names = []
+        self.aliases = {}  # alias_key -> index into names
+        rows, row_names = [], []
+        for canonical, aliases in entries:
+            key = alias_key(canonical)
+            if not key:
+                continue
+            index = self.aliases.get(key)
+            if index is None:
+                index = len(self.names)
+                self.names.append(canonical)
+            for alias in [canonical, *aliases]:
+                alias_k = alias_key(alias)
+                if alias_k and alias_k not in self.aliases:
+                    self.aliases[alias_k] = index
+                    rows.append(" ".join(alias.lower().split()))
+                    row_names.append(index)
+        self.row_names = np.array(row_names)
+        self.row_lengths = np.array([len(alias_key(row)) for row in rows])
+        # No single characters: they make a name score high against any
+        # longer name containing it
+        self.vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), lowercase=True, dtype=np.float32)
+        self.matrix = self.vectorizer.fit_transform(rows).tocsr()
+
+        # Acronyms of multi-word names. Ambiguous ones ("pm": project, product
+        # or program management) and ones that are a skill of their own ("sas",
+        # not "strong analytical skills") don't resolve to them
+        owners = {}
+        for index, name in enumerate(self.names):
+            acronym = initials(name)
+            if acronym:
+                owners.setdefault(acronym, set()).add(index)
+        self.acronyms = {acronym: next(iter(indexes)) for acronym, indexes in owners.items()
+                         if len(indexes) == 1 and acronym not in self.aliases}
+        self.ambiguous_acronyms = frozenset(acronym for acronym, indexes in owners.items() if len(indexes) > 1)
+        self.expanded_acronyms = frozenset(owners)
+
+    @classmethod
+    def from_sources(cls, skill_set_path=SKILL_SET_PATH, use_skillner=True):
+        """
+        Builds the normaliser from skill_set.txt and, if installed, SkillNER's DB.
+        """
+        with open(skill_set_path, "r", encoding="utf-8") as f:
+            entries = [(line.strip(), []) for line in f if line.strip()]
+        if use_skillner:
+            entries += skillner_entries()
+        return cls(entries)
+
+    def match(self, skills):
+        """
+        Returns (canonical, confidence) for each raw skill: confidence 1.0 for
+        an exact alias, otherwise the cosine similarity of the closest row
+        (0 if their lengths differ too much).
+        """
+        import numpy as np
+        results = [None] * len(skills)
+        fuzzy = []
+        for i, skill in enumerate(skills):
+            index = self.aliases.get(alias_key(skill))
+            if index is not None:
+                results[i] = (self.names[index], 1.0)
+            else:
+                fuzzy.append(i)
+        if fuzzy:
+            similarities = self.vectorizer.transform([" ".join(skills[i].lower().split()) for i in fuzzy]) @ self.matrix.T
+            best_rows = np.asarray(similarities.argmax(axis=1)).ravel()
+            best_scores = similarities.max(axis=1).toarray().ravel()
+            lengths = np.array([len(alias_key(skills[i])) for i in fuzzy])
+            best_lengths = self.row_lengths[best_rows]
+            ratios = np.minimum(lengths, best_lengths) / np.maximum(np.maximum(lengths, best_lengths), 1)
+            best_scores[ratios < MIN_LENGTH_RATIO] = 0.0
+            for i, row, score in zip(fuzzy, best_rows, best_scores):
+                results[i] = (self.names[self.row_names[row]], float(score))
+        return results
+
+    def normalise(self, skills, threshold=CONFIDENCE_THRESHOLD):
+        """
+        Returns (canonical skills, low-confidence raw skills), both deduplicated.
+        """
+        skills = [" ".join(skill.split()) for skill in skills if skill.strip()]
+        matched, unsure = {}, {}
+        for skill, (canonical, confidence) in zip(skills, self.match(skills)):
+            if confidence >= threshold:
+                matched.setdefault(alias_key(canonical), canonical)
+            else:
+                unsure.setdefault(alias_key(skill), skill)
+        return list(matched.values()), list(unsure.values())
+
+    def canonical(self, skill):
+        """
+        Returns what names of the same skill share: the index of the known
+        skill it is a name, alias or unambiguous acronym of, else its alias_key.
+        """
+        key = alias_key(skill)
+        index = self.aliases.get(key)
+        if index is None:
+            index = self.acronyms.get(key)
+        return key if index is None else index
+
+    def _acronym_of(self, acronym, canonical):
+        # Whether `acronym` may stand for the skill: not if it is ambiguous or
+        # resolves to another known skill. A known acronym skill ("aws") only
+        # stands for an unknown name with its initials ("amazon web services")
+        if not acronym or acronym in self.ambiguous_acronyms:
+            return False
+        if acronym in self.aliases:
+            return (self.aliases[acronym] == canonical
+                    or (isinstance(canonical, str) and acronym not in self.expanded_acronyms))
+        return self.acronyms.get(acronym, canonical) == canonical
+
+    def covered(self, skills, user_skills):
+        """
+        Returns, for each skill, whether one of `user_skills` names the same
+        skill: the same known skill or alias, or its acronym either way round
+        ("ML" for "machine learning").
+        """
+        import numpy as np
+        user_canonical = {self.canonical(skill) for skill in user_skills}
+        user_keys = {alias_key(skill) for skill in user_skills}
+        user_initials = {}
+        for skill in user_skills:
+            user_initials.setdefault(initials(skill), self.canonical(skill))
+        result = np.zeros(len(skills), dtype=bool)
+        for i, skill in enumerate(skills):
+            canonical = self.canonical(skill)
+            acronym, key = initials(skill), alias_key(skill)
+            result[i] = (canonical in user_canonical
+                         or (acronym in user_keys and self._acronym_of(acronym, canonical))
+                         or (key in user_initials and self._acronym_of(key, user_initials[key])))
+        return result
+
+# Process-wide normaliser, rebuilt if skill_set.txt changes
+_normaliser = None
+_normaliser_source = None  # (absolute path, content hash, (mtime_ns, size))
+_normaliser_lock = threading.Lock()
+
+def get_skill_normaliser(skill_set_path=SKILL_SET_PATH):
+    """
+    Returns the shared SkillNormaliser, building it on first use and
+    rebuilding it when the skill file's content hash changes. The hash is
+    only recomputed when the file's mtime or size differs, as in
+    skill_index.get_skill_index.
+    """
+    global _normaliser, _normaliser_source
+    from skill_index import file_hash, file_stat
+    path = os.path.abspath(skill_set_path)
+    with _normaliser_lock:
+        stat = file_stat(path)
+        if _normaliser is not None and _normaliser_source[0] == path:
+            if stat == _normaliser_source[2]:
+                return _normaliser
+            digest = file_hash(path)
+            if digest == _normaliser_source[1]:
+                _normaliser_source = (path, digest, stat)
+                return _normaliser
+        else:
+            digest = file_hash(path)
+        _normaliser = SkillNormaliser.from_sources(skill_set_path)
+        _normaliser_source = (path, digest, stat)
+        return _normaliser
+
+def clean_skills(text, threshold=CONFIDENCE_THRESHOLD, escalate=True):
+    """
+    Drop-in for clean_text_with_groq: cleans a comma-separated skill list
+    locally and returns it comma-separated.
+
+    Skills matching a known skill with at least `threshold` confidence are
+    replaced by it; only the rest are sent to the LLM (when `escalate`),
+    so most lists need no request at all. Unsure skills are kept as written
+    if the LLM is not asked or fails. Aliases are merged in the result.
+    """
+    with span("skill_normaliser"):
+        skills, unsure = get_skill_normaliser().normalise(text.split(","), threshold)
+    increment("skills_normalised", len(skills), source="local")
+    if unsure:
+        increment("skills_normalised", len(unsure), source="llm" if escalate else "unmatched")
+        cleaned = ", ".join(unsure)
+        if escalate:
+            try:
+                cleaned = clean_text_with_groq(cleaned)
+            except Exception as e:
+                warning(f"Skill cleaning request failed, keeping unmatched skills as written: {e}", error=str(e))
+        skills += [skill.strip() for skill in cleaned.split(",") if skill.strip()]
+    return ", ".join(_dedupe(skills))
+
+def _dedupe(skills):
+    seen = {}
+    for skill in skills:
+        seen.setdefault(alias_key(skill) or skill.lower(), skill)
+    return list(seen.values())
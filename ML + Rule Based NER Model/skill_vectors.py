@@ -0,0 +1,194 @@
+# skill_vectors.py
+import os
+import sys
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from role_index import split_skills, source_hash, read_meta, save_arrays, load_arrays
+from instrumentation import warning
+
+# Bump when the stored layout changes
+FORMAT_VERSION = 2
+VECTORS_MODEL = "en_core_web_lg"
+
+def get_vector_model(name=VECTORS_MODEL):
+    """
+    Returns the spaCy pipeline whose word vectors embed skills (the NER
+    pipeline itself by default, so it is only loaded once).
+    """
+    from model_registry import get_model
+    return get_model(name)
+
+def embed(nlp, skills):
+    """
+    Returns an L2-normalised float32 row per skill: the mean of its token
+    vectors (looked up as written, then lower-cased). Skills without any
+    known token get a zero row, which never matches anything.
+    """
+    vocab = nlp.vocab
+    vectors = np.zeros((len(skills), vocab.vectors_length), dtype=np.float32)
+    for i, skill in enumerate(skills):
+        # Tokenizer only, the rest of the pipeline isn't needed
+        known = [text for text in (token.text if vocab.has_vector(token.text) else token.lower_
+                                   for token in nlp.make_doc(" ".join(skill.split())))
+                 if vocab.has_vector(text)]
+        if known:
+            vectors[i] = np.mean([vocab.get_vector(text) for text in known], axis=0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+class SkillVectors:
+    """
+    Unit-length word vectors of every catalogue skill, stored as float16.
+
+    The cosine similarity of a set of skills to another is then one dense
+    matrix product. Saved matrices are memory-mapped on load, so workers
+    share them through the page cache. Skills outside the catalogue are
+    embedded with the vector model when they are first seen.
+    """
+
+    def __init__(self, matrix, skills, model_name=VECTORS_MODEL):
+        self.matrix = matrix
+        self.skills = skills
+        self.rows = {skill.lower(): row for row, skill in enumerate(skills)}
+        self.model_name = model_name
+
+    @classmethod
+    def build(cls, df, nlp, model_name=VECTORS_MODEL):
+        """
+        Embeds the unique skills of a catalogue DataFrame with a "skills" column.
+        """
+        skills = {}
+        for cell in df['skills']:
+            for skill in split_skills(cell):
+                skills.setdefault(skill.lower(), skill)
+        skills = list(skills.values())
+        return cls(embed(nlp, skills).astype(np.float16), skills, model_name)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def vectors(self, skills):
+        """
+        Returns the float32 rows of the skills, reading catalogue skills from
+        the stored matrix and embedding the others.
+        """
+        rows = [self.rows.get(skill.lower()) for skill in skills]
+        vectors = np.zeros((len(skills), self.matrix.shape[1]), dtype=np.float32)
+        known = [i for i, row in enumerate(rows) if row is not None]
+        if known:
+            vectors[known] = self.matrix[[rows[i] for i in known]]
+        unknown = [i for i, row in enumerate(rows) if row is None]
+        if unknown:
+            vectors[unknown] = embed(get_vector_model(self.model_name), [skills[i] for i in unknown])
+        return vectors
+
+    def similarity(self, skills, other_skills):
+        """
+        Returns the len(skills) x len(other_skills) cosine similarity matrix.
+        """
+        return self.vectors(skills) @ self.vectors(other_skills).T
+
+    def covered(self, skills, user_skills, threshold):
+        """
+        Returns, for each skill, whether one of `user_skills` is at least
+        `threshold` similar to it.
+        """
+        if not skills or not user_skills:
+            return np.zeros(len(skills), dtype=bool)
+        return self.similarity(skills, user_skills).max(axis=1) >= threshold
+
+    def save(self, index_dir, source_hash):
+        """
+        Writes the matrix to `index_dir` as a versioned vectors .npy file
+        and the skills, model and source hash to meta.json.
+        """
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "source_hash": source_hash,
+            "model": self.model_name,
+            "skills": self.skills,
+        }
+        # Versioned by catalogue and model, see role_index.save_arrays
+        version = hashlib.sha256("{}:{}".format(source_hash, self.model_name).encode("utf-8")).hexdigest()[:16]
+        save_arrays(index_dir, {"vectors": self.matrix}, meta, version)
+
+    @classmethod
+    def load(cls, index_dir, mmap=True):
+        """
+        Loads vectors written by save(), memory-mapped unless `mmap` is False.
+        """
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(load_arrays(index_dir, meta, mmap)["vectors"], meta["skills"], meta["model"])
+
+def read_pairs(path):
+    """
+    Returns (user skill, skill, same) for each labelled pair of a CSV like
+    skill_pairs.csv.
+    """
+    df = pd.read_csv(path)
+    return [(row.user_skill, row.skill, bool(row.same)) for row in df.itertuples()]
+
+def calibrate(vectors, pairs):
+    """
+    Returns (threshold, recall): the lowest similarity no distinct pair
+    reaches, and the share of same-skill pairs at or above it.
+    """
+    similarities = np.array([vectors.similarity([skill], [user_skill])[0, 0] for user_skill, skill, _ in pairs],
+                            dtype=np.float32)
+    same = np.array([is_same for _, _, is_same in pairs], dtype=bool)
+    threshold = float(np.nextafter(similarities[~same].max(), np.float32(2))) if (~same).any() else 0.0
+    recall = float((similarities[same] >= threshold).mean()) if same.any() else 0.0
+    return threshold, recall
+
+def build_skill_vectors(csv_path, index_dir, model_name=VECTORS_MODEL):
+    """
+    Embeds the catalogue CSV's skills and stores them in `index_dir`.
+    """
+    digest = source_hash(csv_path)
+    vectors = SkillVectors.build(pd.read_csv(csv_path), get_vector_model(model_name), model_name)
+    vectors.save(index_dir, digest)
+    return vectors
+
+def load_skill_vectors(csv_path, index_dir, model_name=VECTORS_MODEL):
+    """
+    Loads the stored vectors if they were built from the current CSV with
+    the same model, rebuilding and storing them otherwise.
+    """
+    meta = read_meta(index_dir)
+    current = (meta is not None and meta.get("format_version") == FORMAT_VERSION
+               and meta.get("model") == model_name)
+    if not os.path.exists(csv_path):
+        if current:
+            return SkillVectors.load(index_dir)
+        raise FileNotFoundError("Role catalogue {} not found and no skill vectors in {}".format(csv_path, index_dir))
+    digest = source_hash(csv_path)
+    if current and meta.get("source_hash") == digest:
+        try:
+            return SkillVectors.load(index_dir)
+        except FileNotFoundError:
+            pass  # Replaced by a concurrent rebuild from another catalogue
+    vectors = SkillVectors.build(pd.read_csv(csv_path), get_vector_model(model_name), model_name)
+    try:
+        vectors.save(index_dir, digest)
+    except OSError as e:
+        # Read-only deployments can still use the in-memory vectors
+        warning(f"Could not store skill vectors in {index_dir}: {e}", error=str(e))
+    return vectors
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ["calibrate"]:
+        # python skill_vectors.py calibrate [skill_pairs.csv]
+        pairs = read_pairs(sys.argv[2] if len(sys.argv) > 2 else "skill_pairs.csv")
+        dims = get_vector_model().vocab.vectors_length
+        threshold, recall = calibrate(SkillVectors(np.zeros((0, dims), dtype=np.float16), []), pairs)
+        print(f"SKILL_VECTOR_SIMILARITY={threshold:.4f} covers {recall:.0%} of the same-skill pairs and no distinct pair")
+    else:
+        # Build step: python skill_vectors.py [skill_set.csv] [skill_vectors]
+        csv_path = sys.argv[1] if len(sys.argv) > 1 else "skill_set.csv"
+        index_dir = sys.argv[2] if len(sys.argv) > 2 else "skill_vectors"
+        vectors = build_skill_vectors(csv_path, index_dir)
+        print(f"Stored {len(vectors)} skill vectors ({vectors.matrix.shape[1]} dims, float16) in {index_dir}")
@@ -0,0 +1,90 @@
+# stages.py
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class StageTimeout(Exception):
+    """Raised (as a result) for a stage that did not finish within its timeout."""
+
+class StageSkipped(Exception):
+    """Raised (as a result) for a stage not run because a stage it requires failed."""
+
+def _check_requires(stages, requires):
+    unknown = (set(requires) | {need for needs in requires.values() for need in needs}) - set(stages)
+    if unknown:
+        raise ValueError(f"Unknown stages in requires: {sorted(unknown)}")
+    ordered, waiting = set(stages) - set(requires), dict(requires)
+    while waiting:
+        ready = [name for name, needs in waiting.items() if set(needs) <= ordered]
+        if not ready:
+            raise ValueError(f"Stages require each other: {sorted(waiting)}")
+        ordered.update(ready)
+        for name in ready:
+            del waiting[name]
+
+def run_stages(stages, timeouts=None, default_timeout=None, requires=None):
+    """
+    Runs independent stages concurrently and yields (name, result, error)
+    as each one finishes, so callers can show partial results early.
+
+    `stages` maps a stage name to a callable; `timeouts` maps stage names to
+    seconds from the stage's start (falling back to `default_timeout`). A
+    stage that raises is yielded with its exception, and one that runs past
+    its timeout with a StageTimeout; its thread is left to finish in the
+    background. `requires` maps a stage name to the stages it needs: it
+    starts once they all succeed and is called with their results, in that
+    order. If one of them fails or times out it is yielded with a
+    StageSkipped instead, and so are the stages requiring it in turn.
+    """
+    timeouts = timeouts or {}
+    requires = {name: tuple(needs) for name, needs in (requires or {}).items()}
+    _check_requires(stages, requires)
+    executor = ThreadPoolExecutor(max_workers=max(1, len(stages)), thread_name_prefix="stage")
+    waiting = {name: requires.get(name, ()) for name in stages}
+    results, failed = {}, set()
+    pending = {}  # future -> (name, timeout, deadline)
+
+    def start_ready():
+        # Starts the stages whose requirements succeeded, returning the
+        # skipped ones; repeated since skipping a stage skips its dependents
+        skipped, changed = [], True
+        while changed:
+            changed = False
+            for name, needs in list(waiting.items()):
+                missing = [need for need in needs if need in failed]
+                if missing:
+                    del waiting[name]
+                    failed.add(name)
+                    skipped.append((name, None, StageSkipped(f"{name} skipped, {', '.join(missing)} failed")))
+                    changed = True
+                elif all(need in results for need in needs):
+                    del waiting[name]
+                    timeout = timeouts.get(name, default_timeout)
+                    deadline = None if timeout is None else time.monotonic() + timeout
+                    future = executor.submit(stages[name], *(results[need] for need in needs))
+                    pending[future] = (name, timeout, deadline)
+        return skipped
+
+    try:
+        yield from start_ready()
+        while pending:
+            deadlines = [deadline for _, _, deadline in pending.values() if deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, _, _ = pending.pop(future)
+                error = future.exception()
+                if error:
+                    failed.add(name)
+                else:
+                    results[name] = future.result()
+                yield name, results.get(name), error
+            now = time.monotonic()
+            for future, (name, timeout, deadline) in list(pending.items()):
+                if deadline is not None and now >= deadline:
+                    del pending[future]
+                    future.cancel()
+                    failed.add(name)
+                    yield name, None, StageTimeout(f"{name} did not finish within {timeout:g} s")
+            yield from start_ready()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,66 @@
+# tests/conftest.py
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+# Memory-only result cache, so tests never read or write .result_cache.sqlite3
+os.environ["RESULT_CACHE_PATH"] = ""
+
+import pytest
+import spacy
+from spacy.language import Language
+
+import instrumentation
+import model_registry
+
+@Language.component("title_case_tagger")
+def title_case_tagger(doc):
+    """Stands in for the tagger: title-case tokens are proper nouns."""
+    for token in doc:
+        token.pos_ = "PROPN" if token.is_title else ("NUM" if token.like_num else "NOUN")
+    return doc
+
+@pytest.fixture(autouse=True)
+def app_dir(monkeypatch):
+    # The modules read skill_set.txt and the gazetteers relative to the app
+    monkeypatch.chdir(APP_DIR)
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Records spans and counters during the test and clears them afterwards."""
+    monkeypatch.setattr(instrumentation, "ENABLED", True)
+    monkeypatch.setattr(instrumentation, "LOG_PATH", None)
+    yield instrumentation
+    instrumentation.reset()
+
+@pytest.fixture(scope="session")
+def blank_models():
+    """
+    Registers a blank English pipeline under the NER model names, so tests
+    run without en_core_web_lg / en_core_web_md installed.
+    """
+    nlp = spacy.blank("en")
+    nlp.add_pipe("title_case_tagger")
+    for name in ("en_core_web_lg", "en_core_web_md"):
+        model_registry._models[name] = nlp
+    return nlp
+
+JOB_DESCRIPTION = "data scientist python machine learning statistics sql"
+
+@pytest.fixture
+def catalogue(tmp_path, monkeypatch):
+    """Points recommendation at a two-role catalogue in tmp_path."""
+    import recommendation
+    csv_path = tmp_path / "roles.csv"
+    csv_path.write_text('role,skills\n'
+                        'Data Scientist,"python, machine learning, sql, statistics"\n'
+                        'Backend Developer,"java, docker, sql"\n')
+    monkeypatch.setattr(recommendation, "CATALOGUE_PATH", str(csv_path))
+    monkeypatch.setattr(recommendation, "ROLE_INDEX_DIR", str(tmp_path / "role_index"))
+    monkeypatch.setattr(recommendation, "SKILL_VECTORS_DIR", str(tmp_path / "skill_vectors"))
+    recommendation.get_role_index.cache_clear()
+    recommendation.get_skill_vectors.cache_clear()
+    yield
+    recommendation.get_role_index.cache_clear()
+    recommendation.get_skill_vectors.cache_clear()
@@ -0,0 +1,33 @@
+# tests/test_cleaning_module.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import cleaning_module
+
+def completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def empty_answer(monkeypatch):
+    """Groq clients whose completions have no content, as for refusals."""
+    async def create_async(**kwargs):
+        return completion(None)
+    monkeypatch.setattr(cleaning_module, "api_key", "test-key")
+    monkeypatch.setattr(cleaning_module, "get_client", lambda: SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: completion(None)))))
+    monkeypatch.setattr(cleaning_module, "get_async_client", lambda: SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create_async))))
+
+def test_empty_completion(empty_answer):
+    assert cleaning_module.clean_text_with_groq("python", stream=False, use_cache=False) == ""
+
+def test_empty_completion_falls_back_in_deterministic_mode(empty_answer):
+    cleaned = cleaning_module.clean_text_with_groq(" python,  Python , sql", use_cache=False, deterministic=True)
+    assert cleaned == "python, sql"
+
+def test_empty_async_completion(empty_answer):
+    clean = cleaning_module.clean_text_with_groq_async
+    assert asyncio.run(clean("python", stream=False, use_cache=False)) == ""
+    assert asyncio.run(clean("python, Python", use_cache=False, deterministic=True)) == "python"
@@ -0,0 +1,36 @@
+# tests/test_ner_module.py
+import ner_module
+
+RESUME = """John Smith
+Phone: +91 98765 43210
+Email: john.smith@example.com
+
+Education
+Bachelor of Technology, KIIT University, 2019
+
+Work Experience
+Data Engineer, Infosys (2019 - 2022)
+
+Technical Skills
+python, sql, docker
+"""
+
+def test_extract_resume_end_to_end(blank_models):
+    record = ner_module.extract_resume("resume.txt", RESUME, use_cache=False)
+    assert record["file_name"] == "resume.txt"
+    assert record["email"] == ["john.smith@example.com"]
+    assert "John Smith" in record["name"]
+    assert {"python", "sql", "docker"} <= set(record["skills"])
+    assert record["cached"] is False
+    # get_skills_and_scores records its sub-stages next to the extractors'
+    assert {"parse", "sections", "skills", "email"} <= set(record["timings"])
+
+def test_extract_resume_without_shared_doc(blank_models):
+    record = ner_module.extract_resume("resume.txt", RESUME, shared_doc=False, use_cache=False)
+    assert record["email"] == ["john.smith@example.com"]
+
+def test_extract_resume_served_from_cache(blank_models):
+    first = ner_module.extract_resume("resume.txt", RESUME)
+    second = ner_module.extract_resume("resume.txt", RESUME)
+    assert second["cached"] is True
+    assert second["skills"] == first["skills"]
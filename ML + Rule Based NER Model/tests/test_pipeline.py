@@ -0,0 +1,65 @@
+# tests/test_pipeline.py
+import json
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.request import urlopen
+
+import pytest
+
+import pipeline
+import recommendation
+import skill_normaliser
+from conftest import JOB_DESCRIPTION
+
+class StubCatalogue:
+    def lookup_many(self, skills):
+        return {skill: [(f"{skill} course", "https://example.invalid/course")] for skill in skills}
+
+@pytest.fixture
+def resume_file(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("Jane Doe\nEmail: jane@example.com\n\nTechnical Skills\npython, sql\n")
+    return str(path)
+
+@pytest.fixture
+def no_llm(monkeypatch, catalogue):
+    monkeypatch.setattr(recommendation, "get_course_catalogue", StubCatalogue)
+
+    def groq_called(text, **kwargs):
+        pytest.fail(f"Groq called with {text!r}")
+    monkeypatch.setattr(skill_normaliser, "clean_text_with_groq", groq_called)
+
+def test_no_clean_skips_every_cleaning_step(blank_models, resume_file, no_llm, monkeypatch):
+    monkeypatch.setattr(pipeline, "clean_skills", lambda text: pytest.fail("skills cleaned"))
+    monkeypatch.setattr(recommendation, "clean_skills", lambda text: pytest.fail("missing skills cleaned"))
+    result = pipeline.process_file(resume_file, JOB_DESCRIPTION, clean=False, score=False)
+    assert result["errors"] == {}
+    assert {"python", "sql"} <= set(result["skills"])
+    assert "machine learning" in result["missing_skills"]
+    assert {"extract", "ner", "recommend"} <= set(result["timings"])
+
+def test_extract_failure_record_has_timings(tmp_path):
+    result = pipeline.process_file(str(tmp_path / "missing.pdf"))
+    assert "extract" in result["errors"]
+    assert set(result["timings"]) == {"extract"}
+
+def test_health_and_metrics_report_the_same_snapshot(metrics):
+    with metrics.span("pipeline.ner"):
+        pass
+    metrics.increment("pipeline_stage_errors", stage="score")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), pipeline.make_handler(1, {}))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urlopen(base + "/health") as response:
+            health = json.load(response)
+        with urlopen(base + "/metrics") as response:
+            prometheus = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert health["status"] == "ok"
+    assert health["metrics"]["stages"][0]["stage"] == "pipeline.ner"
+    assert health["metrics"]["counters"] == [{"name": "pipeline_stage_errors", "labels": {"stage": "score"}, "value": 1}]
+    assert 'resume_stage_seconds_count{stage="pipeline.ner",status="ok"} 1' in prometheus
+    assert 'resume_pipeline_stage_errors_total{stage="score"} 1' in prometheus
@@ -0,0 +1,108 @@
+# tests/test_recommendation.py
+import os
+import importlib.util
+from types import SimpleNamespace
+import numpy as np
+import pytest
+import spacy
+
+import model_registry
+import recommendation
+from skill_normaliser import SkillNormaliser
+from skill_vectors import VECTORS_MODEL, SkillVectors, calibrate, read_pairs
+from conftest import APP_DIR, JOB_DESCRIPTION
+
+@pytest.fixture(autouse=True)
+def local_normaliser(monkeypatch):
+    # skill_set.txt only, so results don't depend on SkillNER being installed
+    normaliser = SkillNormaliser.from_sources(use_skillner=False)
+    monkeypatch.setattr(recommendation, "get_skill_normaliser", lambda: normaliser)
+
+@pytest.fixture
+def synthetic_vectors(monkeypatch):
+    """
+    Registers a pipeline whose "stats" vector lies close to "statistics",
+    in place of the vector model.
+    """
+    rng = np.random.default_rng(0)
+    nlp = spacy.blank("en")
+    for word in ("python", "sql", "docker", "java", "machine", "learning"):
+        nlp.vocab.set_vector(word, rng.normal(size=50).astype(np.float32))
+    statistics = rng.normal(size=50)
+    nlp.vocab.set_vector("statistics", statistics.astype(np.float32))
+    nlp.vocab.set_vector("stats", (statistics + rng.normal(scale=0.2, size=50)).astype(np.float32))
+    monkeypatch.setitem(model_registry._models, VECTORS_MODEL, nlp)
+    return nlp
+
+def test_acronyms_are_covered_by_default(catalogue):
+    assert recommendation.SEMANTIC_MATCH
+    missing = recommendation.recommend_missing_skills(JOB_DESCRIPTION, "python, ML")
+    assert "machine learning" not in missing
+    assert {"sql", "statistics"} <= set(missing)
+
+def test_exact_matching(catalogue):
+    missing = recommendation.recommend_missing_skills(JOB_DESCRIPTION, "python, ML", semantic=False)
+    assert "machine learning" in missing
+
+def test_vector_matching_needs_a_threshold(catalogue, synthetic_vectors, monkeypatch):
+    assert "statistics" in recommendation.recommend_missing_skills(JOB_DESCRIPTION, "python, stats")
+    monkeypatch.setattr(recommendation, "SKILL_SIMILARITY", 0.8)
+    missing = recommendation.recommend_missing_skills(JOB_DESCRIPTION, "python, stats")
+    assert "statistics" not in missing
+    assert "sql" in missing
+
+def test_vector_matching_falls_back_without_vector_model(catalogue, monkeypatch):
+    import skill_vectors
+
+    def missing_model(name):
+        raise OSError(f"[E050] Can't find model '{name}'")
+    monkeypatch.setattr(skill_vectors, "get_vector_model", missing_model)
+    monkeypatch.setattr(recommendation, "SKILL_SIMILARITY", 0.8)
+    missing = recommendation.recommend_missing_skills(JOB_DESCRIPTION, "python, stats, ML")
+    assert "statistics" in missing
+    assert "machine learning" not in missing
+
+def test_calibration_separates_labelled_pairs(synthetic_vectors):
+    vectors = SkillVectors(np.zeros((0, 50), dtype=np.float16), [])
+    pairs = [("stats", "statistics", True), ("python", "java", False), ("sql", "docker", False)]
+    threshold, recall = calibrate(vectors, pairs)
+    assert recall == 1.0
+    assert not vectors.covered(["java"], ["python"], threshold)[0]
+    assert vectors.covered(["statistics"], ["stats"], threshold)[0]
+
+@pytest.mark.skipif(importlib.util.find_spec(VECTORS_MODEL) is None, reason=f"{VECTORS_MODEL} not installed")
+def test_calibration_on_real_vectors():
+    """skill_pairs.csv can be separated with the real vectors."""
+    vectors = SkillVectors(np.zeros((0, 300), dtype=np.float16), [])
+    threshold, recall = calibrate(vectors, read_pairs(os.path.join(APP_DIR, "skill_pairs.csv")))
+    assert threshold <= 1.0 and recall > 0
+
+@pytest.mark.parametrize("scores", [(0.5, 0.5, 0.5), (0.5, 0.4999, 0.5001)])
+def test_tied_roles_keep_all_their_skills(scores):
+    role_index = SimpleNamespace(role_skills=[["python", "sql"], ["java", "docker"], ["excel", "SQL"]])
+    weights = recommendation.required_skill_weights(role_index, list(enumerate(scores)))
+    kept = {key for key, (_, weight) in weights.items() if weight >= recommendation.MIN_SKILL_WEIGHT}
+    assert kept == {"python", "sql", "java", "docker", "excel"}
+    # Required by two of the roles, so ranked first
+    assert max(weights, key=lambda key: weights[key][1]) == "sql"
+
+def test_best_role_skills_are_always_kept():
+    role_index = SimpleNamespace(role_skills=[["python"], ["java"], ["excel"]])
+    weights = recommendation.required_skill_weights(role_index, [(0, 0.2), (1, 0.05), (2, 0.01)])
+    assert weights["python"][1] >= 1 > recommendation.MIN_SKILL_WEIGHT > weights["java"][1]
+
+def test_match_matrix_agrees_with_recommend_missing_skills(catalogue):
+    job_descs = [JOB_DESCRIPTION, "backend developer java docker"]
+    skill_sets = ["python, ML", "java, sql", "", "statistics, docker"]
+    result = recommendation.match_matrix(job_descs, skill_sets)
+    assert result["scores"].shape == result["coverage"].shape == (2, 4)
+    for i, job_desc in enumerate(job_descs):
+        for j, skills in enumerate(skill_sets):
+            assert result["missing"][i][j] == recommendation.recommend_missing_skills(job_desc, skills)
+    assert "machine learning" not in result["missing"][0][0]
+
+@pytest.mark.parametrize("job_descs, skill_sets", [([], []), ([JOB_DESCRIPTION], []), ([], ["python"])])
+def test_match_matrix_empty_inputs(catalogue, job_descs, skill_sets):
+    result = recommendation.match_matrix(job_descs, skill_sets)
+    assert result["scores"].shape == result["coverage"].shape == (len(job_descs), len(skill_sets))
+    assert result["missing"] == [[[] for _ in skill_sets] for _ in job_descs]
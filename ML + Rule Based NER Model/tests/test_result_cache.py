@@ -0,0 +1,68 @@
+# tests/test_result_cache.py
+from types import SimpleNamespace
+
+import pytest
+
+import ner_module
+import result_cache
+from result_cache import ResultCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the cache's time.time() with a clock the test advances."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(result_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_entries_expire_after_ttl(tmp_path, clock, on_disk):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3") if on_disk else "", max_memory_items=0 if on_disk else 8,
+                        ttl=60)
+    cache.set("key", {"skills": ["python"]})
+    clock.now += 59
+    assert cache.get("key") == {"skills": ["python"]}
+    clock.now += 1
+    assert cache.get("key") is None
+
+def test_memory_evicts_least_recently_used(clock):
+    cache = ResultCache("", max_memory_items=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert [cache.get(key) for key in ("a", "b", "c")] == [1, None, 3]
+    assert cache.stats()["evictions"] == 1
+
+def test_disk_evicts_least_recently_used_and_expired(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"), max_memory_items=0, max_disk_items=2, ttl=60)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    assert cache.get("a") == 1
+    clock.now += 1
+    cache.set("c", 3)
+    assert [cache.get(key) for key in ("a", "b", "c")] == [1, None, 3]
+    clock.now += 59
+    cache.set("d", 4)  # a and b were written over 60 seconds ago
+    assert cache.stats()["disk_items"] == 2
+    assert [cache.get(key) for key in ("a", "c", "d")] == [None, 3, 4]
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_hits_are_copies(tmp_path, on_disk):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3") if on_disk else "")
+    value = {"skills": ["python"]}
+    cache.set("key", value)
+    value["skills"].append("sql")
+    hit = cache.get("key")
+    hit["skills"].append("java")
+    assert cache.get("key") == {"skills": ["python"]}
+
+def test_ner_version_bump_invalidates_records(blank_models, monkeypatch):
+    cache = ResultCache("")
+    monkeypatch.setattr(ner_module, "get_cache", lambda: cache)
+    text = "Jane Doe\nEmail: jane@example.com\n\nTechnical Skills\npython, sql\n"
+    assert not ner_module.extract_resume("a.txt", text)["cached"]
+    assert ner_module.extract_resume("b.txt", text)["cached"]
+    monkeypatch.setattr(ner_module, "NER_VERSION", ner_module.NER_VERSION + ".test")
+    assert not ner_module.extract_resume("c.txt", text)["cached"]
@@ -0,0 +1,42 @@
+# tests/test_role_index.py
+import os
+import numpy as np
+from role_index import load_role_index, read_meta
+
+def write_catalogue(path, rows):
+    with open(path, "w") as f:
+        f.write("role,skills\n")
+        for role, skills in rows:
+            f.write(f'{role},"{skills}"\n')
+
+def test_rebuild_keeps_mapped_index_readable(tmp_path):
+    csv_path, index_dir = str(tmp_path / "roles.csv"), str(tmp_path / "role_index")
+    write_catalogue(csv_path, [("Data Scientist", "python, machine learning, sql"),
+                               ("Backend Developer", "java, docker, sql")])
+    old = load_role_index(csv_path, index_dir)
+    old_scores = old.scores("python sql").copy()
+    old_files = set(read_meta(index_dir)["arrays"].values())
+
+    write_catalogue(csv_path, [("Frontend Developer", "javascript, react, css"),
+                               ("Data Engineer", "python, spark, airflow"),
+                               ("DevOps Engineer", "docker, kubernetes, terraform")])
+    new = load_role_index(csv_path, index_dir)
+
+    # The rebuild wrote new files instead of rewriting the mapped ones
+    new_files = set(read_meta(index_dir)["arrays"].values())
+    assert not new_files & old_files
+    assert set(os.listdir(index_dir)) == new_files | {"meta.json"}
+    np.testing.assert_array_equal(old.scores("python sql"), old_scores)
+    assert len(new) == 3
+    assert new.role_names[new.top_k("kubernetes terraform", 1)[0][0]] == "DevOps Engineer"
+
+def test_unchanged_catalogue_loads_stored_index(tmp_path):
+    csv_path, index_dir = str(tmp_path / "roles.csv"), str(tmp_path / "role_index")
+    write_catalogue(csv_path, [("Data Scientist", "python, machine learning, sql")])
+    load_role_index(csv_path, index_dir)
+    index = load_role_index(csv_path, index_dir)
+    # scipy wraps the arrays in views; the memory map is underneath
+    array = index.matrix.data
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    assert array is not None
@@ -0,0 +1,57 @@
+# tests/test_scoring_client.py
+import json
+import pytest
+
+pytest.importorskip("google.generativeai")
+from scoring_client import ScoringClient, ScoringError, SCORE_FIELDS
+
+SCORES = {field: 80 for field in SCORE_FIELDS}
+
+class Reply:
+    def __init__(self, text=None):
+        self._text = text
+        self.usage_metadata = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            # What the SDK raises for blocked or empty candidates
+            raise ValueError("The response.text quick accessor requires the response to contain a valid Part")
+        return self._text
+
+class FakeModel:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+
+    def generate_content(self, contents, generation_config=None):
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+def client_with(*replies):
+    client = ScoringClient(use_cache=False)
+    client.model = FakeModel(*replies)
+    return client
+
+def test_valid_reply():
+    assert client_with(Reply(json.dumps(SCORES))).score("prompt", ["resume"]) == SCORES
+
+def test_invalid_reply_is_repaired_once():
+    client = client_with(Reply("not json"), Reply(json.dumps(SCORES)))
+    assert client.score("prompt", ["resume"]) == SCORES
+    assert [call["stage"] for call in client.calls] == ["score", "repair"]
+
+def test_blocked_reply_raises_scoring_error():
+    client = client_with(Reply(None))
+    with pytest.raises(ScoringError, match="No usable reply"):
+        client.score("prompt", ["resume"])
+    assert client.calls[-1]["ok"] is False
+
+def test_blocked_repair_raises_scoring_error():
+    with pytest.raises(ScoringError):
+        client_with(Reply("not json"), Reply(None)).score("prompt", ["resume"])
+
+def test_failed_request_raises_scoring_error():
+    with pytest.raises(ScoringError, match="failed"):
+        client_with(ConnectionError("timed out")).score("prompt", ["resume"])
@@ -0,0 +1,26 @@
+# tests/test_skill_index.py
+import pytest
+import spacy
+
+from skill_index import SkillIndex
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    corpus = tmp_path_factory.mktemp("skills") / "skill_set.txt"
+    corpus.write_text("c\nc#\nc++\nobjective-c\nmachine learning\nlearning\n")
+    return SkillIndex(spacy.blank("en"), str(corpus))
+
+@pytest.mark.parametrize("text, expected", [
+    ("C#", ["c#"]),
+    ("Objective-C", ["objective-c"]),
+    ("C++", ["c++"]),
+    ("C and C++", ["c", "c++"]),
+    ("machine learning", ["machine learning"]),
+])
+def test_longest_match_wins(index, text, expected):
+    assert index.skills(text) == expected
+
+def test_offsets(index):
+    text = "Wrote Objective-C and C# code"
+    assert [(skill, text[start:end]) for skill, start, end in index.find(text)] == [
+        ("objective-c", "Objective-C"), ("c#", "C#")]
@@ -0,0 +1,99 @@
+# tests/test_skill_normaliser.py
+import os
+import pandas as pd
+import pytest
+
+import skill_normaliser
+from skill_normaliser import SkillNormaliser, CONFIDENCE_THRESHOLD
+from conftest import APP_DIR
+
+@pytest.fixture(scope="module")
+def normaliser():
+    # skill_set.txt only, so results don't depend on SkillNER being installed
+    return SkillNormaliser.from_sources(use_skillner=False)
+
+@pytest.fixture
+def local_only(monkeypatch, normaliser):
+    monkeypatch.setattr(skill_normaliser, "get_skill_normaliser", lambda: normaliser)
+
+def canonical(normaliser, skill):
+    (name, confidence), = normaliser.match([skill])
+    return name if confidence >= CONFIDENCE_THRESHOLD else None
+
+@pytest.mark.parametrize("raw, expected", [
+    ("node js", "Node.js"),
+    ("nodejs", "Node.js"),
+    ("Java Script", "javascript"),
+    ("machne learning", "machine learning"),
+    ("javascrpt", "javascript"),
+    ("tensorflw", "tensorflow"),
+])
+def test_aliases_and_typos_are_resolved_locally(normaliser, raw, expected):
+    assert canonical(normaliser, raw) == expected
+
+@pytest.mark.parametrize("raw", ["amazon web services", "java ee", "Leadership", "reactjs", "mongo db"])
+def test_contained_or_distant_names_are_not_trusted(normaliser, raw):
+    # e.g. "amazon web services" must not become "web services"
+    assert canonical(normaliser, raw) is None
+
+def test_c_family_stays_distinct(normaliser):
+    assert [name for name, _ in normaliser.match(["C", "C++", "c#"])] == ["c", "c++", "c#"]
+
+def test_typo_against_skillner_style_entries():
+    normaliser = SkillNormaliser([("deep learning", []), ("machine learning", []),
+                                  ("Node.js", ["node js", "nodejs"])])
+    skills, unsure = normaliser.normalise(["deep lerning", "nodejs", "node js"])
+    assert skills == ["deep learning", "Node.js"]
+    assert unsure == []
+
+def test_only_unsure_skills_are_escalated(monkeypatch, local_only):
+    sent = []
+
+    def fake_groq(text, **kwargs):
+        sent.append(text)
+        return "Amazon Web Services"
+    monkeypatch.setattr(skill_normaliser, "clean_text_with_groq", fake_groq)
+    cleaned = skill_normaliser.clean_skills("python, node js, amazon web services, Python")
+    assert sent == ["amazon web services"]
+    assert cleaned == "python, Node.js, Amazon Web Services"
+
+def test_failed_escalation_keeps_skills_as_written(monkeypatch, local_only):
+    def failing_groq(text, **kwargs):
+        raise RuntimeError("no network")
+    monkeypatch.setattr(skill_normaliser, "clean_text_with_groq", failing_groq)
+    assert skill_normaliser.clean_skills("python, java ee") == "python, java ee"
+
+def test_no_escalation(monkeypatch, local_only):
+    monkeypatch.setattr(skill_normaliser, "clean_text_with_groq", pytest.fail)
+    assert skill_normaliser.clean_skills("python, java ee", escalate=False) == "python, java ee"
+
+def labelled_pairs():
+    # Synonyms the name tables can't tell ("JS") are left to the word vectors
+    df = pd.read_csv(os.path.join(APP_DIR, "skill_pairs.csv"))
+    return [(row.user_skill, row.skill, bool(row.same)) for row in df.itertuples() if row.kind != "synonym"]
+
+@pytest.mark.parametrize("user_skill, skill, same", labelled_pairs())
+def test_labelled_pairs(normaliser, user_skill, skill, same):
+    assert normaliser.covered([skill], [user_skill])[0] == same
+
+def test_ambiguous_acronyms_cover_nothing(normaliser):
+    assert "pm" in normaliser.ambiguous_acronyms
+    assert not normaliser.covered(["project management", "product management"], ["PM"]).any()
+
+def test_skill_file_is_hashed_only_when_it_changes(tmp_path, monkeypatch):
+    import skill_index
+    hashed = []
+    file_hash = skill_index.file_hash
+    monkeypatch.setattr(skill_index, "file_hash", lambda path: hashed.append(path) or file_hash(path))
+    monkeypatch.setattr(skill_normaliser, "_normaliser", None)
+    monkeypatch.setattr(skill_normaliser, "_normaliser_source", None)
+    skills = tmp_path / "skill_set.txt"
+    skills.write_text("python\nsql\n")
+
+    first = skill_normaliser.get_skill_normaliser(str(skills))
+    assert skill_normaliser.get_skill_normaliser(str(skills)) is first
+    assert len(hashed) == 1
+    skills.write_text("python\nsql\ndocker\n")
+    rebuilt = skill_normaliser.get_skill_normaliser(str(skills))
+    assert rebuilt is not first and "docker" in rebuilt.names
+    assert len(hashed) == 2
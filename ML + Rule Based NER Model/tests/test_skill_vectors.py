@@ -0,0 +1,53 @@
+# tests/test_skill_vectors.py
+import os
+import numpy as np
+import pytest
+import spacy
+
+import model_registry
+from role_index import read_meta
+from skill_vectors import load_skill_vectors
+
+MODEL = "test_vectors"
+
+@pytest.fixture(scope="module")
+def vector_model():
+    """A blank pipeline with a few hand-made word vectors."""
+    rng = np.random.default_rng(0)
+    nlp = spacy.blank("en")
+    for word in ("python", "sql", "docker", "java", "react", "spark"):
+        nlp.vocab.set_vector(word, rng.normal(size=16).astype(np.float32))
+    model_registry._models[MODEL] = nlp
+    yield nlp
+    del model_registry._models[MODEL]
+
+def write_catalogue(path, rows):
+    with open(path, "w") as f:
+        f.write("role,skills\n")
+        for role, skills in rows:
+            f.write(f'{role},"{skills}"\n')
+
+def test_vectors_are_stored_as_mapped_float16(tmp_path, vector_model):
+    csv_path, index_dir = str(tmp_path / "roles.csv"), str(tmp_path / "skill_vectors")
+    write_catalogue(csv_path, [("Backend Developer", "Python, SQL, Docker")])
+    load_skill_vectors(csv_path, index_dir, MODEL)
+    vectors = load_skill_vectors(csv_path, index_dir, MODEL)
+    assert isinstance(vectors.matrix, np.memmap)
+    assert vectors.matrix.dtype == np.float16
+    assert vectors.covered(["sql", "java"], ["SQL"], 0.99).tolist() == [True, False]
+
+def test_rebuild_keeps_mapped_vectors_readable(tmp_path, vector_model):
+    csv_path, index_dir = str(tmp_path / "roles.csv"), str(tmp_path / "skill_vectors")
+    write_catalogue(csv_path, [("Backend Developer", "python, sql, docker")])
+    old = load_skill_vectors(csv_path, index_dir, MODEL)
+    old_matrix = np.array(old.matrix)
+    old_files = set(read_meta(index_dir)["arrays"].values())
+
+    write_catalogue(csv_path, [("Frontend Developer", "react, java"), ("Data Engineer", "spark")])
+    new = load_skill_vectors(csv_path, index_dir, MODEL)
+
+    new_files = set(read_meta(index_dir)["arrays"].values())
+    assert not new_files & old_files
+    assert set(os.listdir(index_dir)) == new_files | {"meta.json"}
+    np.testing.assert_array_equal(old.matrix, old_matrix)
+    assert new.skills == ["react", "java", "spark"]
@@ -0,0 +1,71 @@
+# tests/test_stages.py
+import threading
+import time
+
+import pytest
+
+from stages import run_stages, StageTimeout, StageSkipped
+
+@pytest.fixture
+def release():
+    """An event slow stages wait on, set when the test ends."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+def fail(message):
+    def stage(*args):
+        raise RuntimeError(message)
+    return stage
+
+def collect(stages, **kwargs):
+    return {name: (result, error) for name, result, error in run_stages(stages, **kwargs)}
+
+def test_slow_stage_times_out_while_others_finish(release):
+    start = time.monotonic()
+    results = collect({
+        "slow": lambda: release.wait(10),
+        "fast": lambda: "done",
+        "broken": fail("no network"),
+    }, timeouts={"slow": 0.2})
+    assert time.monotonic() - start < 2
+    assert results["fast"] == ("done", None)
+    assert isinstance(results["broken"][1], RuntimeError)
+    assert results["slow"][0] is None and isinstance(results["slow"][1], StageTimeout)
+
+def test_results_are_yielded_as_stages_finish(release):
+    order = [name for name, _, _ in run_stages({"slow": lambda: release.wait(0.3), "fast": lambda: 1})]
+    assert order == ["fast", "slow"]
+
+def test_dependents_get_the_results_of_their_requirements():
+    results = collect({
+        "ner": lambda: ["python", "ML"],
+        "clean": lambda skills: [skill.lower() for skill in skills],
+        "recommend": lambda skills, cleaned: len(skills) + len(cleaned),
+    }, requires={"clean": ["ner"], "recommend": ["ner", "clean"]})
+    assert results == {"ner": (["python", "ML"], None), "clean": (["python", "ml"], None), "recommend": (4, None)}
+
+def test_failed_requirement_skips_its_dependents():
+    ran = []
+    results = collect({
+        "ner": fail("bad resume"),
+        "clean": lambda skills: ran.append("clean"),
+        "recommend": lambda skills: ran.append("recommend"),
+        "score": lambda: "scored",
+    }, requires={"clean": ["ner"], "recommend": ["clean"]})
+    assert ran == []
+    assert isinstance(results["ner"][1], RuntimeError)
+    assert isinstance(results["clean"][1], StageSkipped)
+    assert isinstance(results["recommend"][1], StageSkipped)
+    assert results["score"] == ("scored", None)
+
+def test_timed_out_requirement_skips_its_dependents(release):
+    results = collect({"ner": lambda: release.wait(10), "clean": lambda skills: skills},
+                      timeouts={"ner": 0.1}, requires={"clean": ["ner"]})
+    assert isinstance(results["ner"][1], StageTimeout)
+    assert isinstance(results["clean"][1], StageSkipped)
+
+@pytest.mark.parametrize("requires", [{"clean": ["parse"]}, {"a": ["b"], "b": ["a"]}])
+def test_invalid_requires(requires):
+    with pytest.raises(ValueError):
+        list(run_stages({"a": lambda *args: 1, "b": lambda *args: 2, "clean": lambda *args: 3}, requires=requires))
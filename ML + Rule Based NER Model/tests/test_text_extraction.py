@@ -0,0 +1,33 @@
+# tests/test_text_extraction.py
+import pytest
+
+import text_extraction
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    fitz = pytest.importorskip("fitz")
+    document = fitz.open()
+    for number in range(3):
+        document.new_page().insert_text((72, 72), f"page {number + 1}")
+    data = document.tobytes()
+    document.close()
+    return data
+
+@pytest.fixture(params=["fitz", "pdfplumber"])
+def backend(request, monkeypatch):
+    pytest.importorskip(request.param)
+    if request.param == "pdfplumber":
+        def no_fitz(source, max_pages):
+            raise ImportError("No module named 'fitz'")
+        monkeypatch.setattr(text_extraction, "_iter_pdf_pages_fitz", no_fitz)
+    return request.param
+
+@pytest.mark.parametrize("max_pages, expected", [(None, 3), (1, 1), (2, 2), (5, 3)])
+def test_max_pages(pdf_bytes, backend, max_pages, expected):
+    pages = list(text_extraction.iter_pdf_pages(pdf_bytes, max_pages))
+    assert [page.strip() for page in pages] == [f"page {number + 1}" for number in range(expected)]
+
+@pytest.mark.parametrize("max_pages", [0, -1])
+def test_max_pages_below_one_is_rejected(pdf_bytes, backend, max_pages):
+    with pytest.raises(ValueError):
+        list(text_extraction.iter_pdf_pages(pdf_bytes, max_pages))
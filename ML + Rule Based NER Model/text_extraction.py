@@ -0,0 +1,109 @@
+# text_extraction.py
+import io
+import os
+from instrumentation import span
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+def _read_bytes(source):
+    """
+    Returns the raw bytes of a path, a bytes object or a file-like object
+    (e.g. a Streamlit UploadedFile).
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    return source.read()
+
+def detect_kind(source, filename=None, mime_type=None):
+    """
+    Returns "pdf", "docx" or "txt" from the MIME type or the file extension.
+    """
+    if mime_type == PDF_MIME:
+        return "pdf"
+    if mime_type == DOCX_MIME:
+        return "docx"
+    if filename is None and isinstance(source, (str, os.PathLike)):
+        filename = os.fspath(source)
+    if filename is None:
+        filename = getattr(source, "name", "") or ""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".pdf":
+        return "pdf"
+    if extension == ".docx":
+        return "docx"
+    return "txt"
+
+def _iter_pdf_pages_fitz(source, max_pages):
+    import fitz
+    if isinstance(source, (str, os.PathLike)):
+        # Opening by path lets PyMuPDF read pages on demand
+        document = fitz.open(source)
+    else:
+        document = fitz.open(stream=_read_bytes(source), filetype="pdf")
+    with document:
+        page_count = document.page_count if max_pages is None else min(document.page_count, max_pages)
+        for number in range(page_count):
+            yield document.load_page(number).get_text()
+
+def _iter_pdf_pages_pdfplumber(source, max_pages):
+    import pdfplumber
+    if not isinstance(source, (str, os.PathLike)):
+        source = io.BytesIO(_read_bytes(source))
+    with pdfplumber.open(source) as pdf:
+        for page in pdf.pages[:max_pages]:
+            # extract_text returns None for pages without a text layer
+            yield page.extract_text() or ""
+            page.close()
+
+def iter_pdf_pages(source, max_pages=None):
+    """
+    Yields the text of each PDF page lazily, using PyMuPDF when it is
+    installed and can open the file, and pdfplumber otherwise. `max_pages`
+    None reads every page; otherwise it must be at least 1.
+    """
+    if max_pages is not None and max_pages < 1:
+        raise ValueError(f"max_pages must be at least 1 or None, got {max_pages}")
+    if not isinstance(source, (str, os.PathLike)):
+        # File-like sources are read once so both backends can use them
+        source = _read_bytes(source)
+    try:
+        pages = _iter_pdf_pages_fitz(source, max_pages)
+        first = next(pages, None)
+    except Exception:
+        # PyMuPDF missing or unable to open the file
+        yield from _iter_pdf_pages_pdfplumber(source, max_pages)
+        return
+    if first is not None:
+        yield first
+        yield from pages
+
+def iter_pages(source, filename=None, mime_type=None, max_pages=None):
+    """
+    Yields the document's text page by page.
+
+    `source` is a path, bytes or a file-like object; the format is taken
+    from `mime_type` or the file extension. DOCX and TXT files have no
+    pages and are yielded as a single page. At most `max_pages` pages are
+    read when it is given.
+    """
+    kind = detect_kind(source, filename, mime_type)
+    if kind == "pdf":
+        yield from iter_pdf_pages(source, max_pages)
+    elif kind == "docx":
+        import docx2txt
+        yield docx2txt.process(io.BytesIO(_read_bytes(source))) or ""
+    else:
+        yield _read_bytes(source).decode("utf-8", errors="replace")
+
+def extract_text(source, filename=None, mime_type=None, max_pages=None):
+    """
+    Returns the document's text, with pages joined by newlines.
+    """
+    with span("extract_text", kind=detect_kind(source, filename, mime_type)):
+        return "\n".join(iter_pages(source, filename, mime_type, max_pages))
@@ -0,0 +1,75 @@
+# warmup.py
+import time
+import threading
+
+class WarmUp:
+    """
+    Runs named loading tasks in background daemon threads and tracks them,
+    so a UI can show what is still loading and only wait for what it needs.
+    A task's state is "running", "ready" or "failed".
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tasks = {}
+
+    def start(self, tasks):
+        """
+        Starts each task of {name: callable} that isn't already started, in
+        its own thread. Returns self.
+        """
+        for name, func in tasks.items():
+            with self.lock:
+                if name in self.tasks:
+                    continue
+                task = {"state": "running", "seconds": None, "error": None, "done": threading.Event()}
+                self.tasks[name] = task
+            threading.Thread(target=self._run, args=(task, func), name=f"warm-up-{name}", daemon=True).start()
+        return self
+
+    def status(self):
+        """
+        Returns {name: {"state", "seconds", "error"}} for every task.
+        """
+        with self.lock:
+            return {name: {key: task[key] for key in ("state", "seconds", "error")}
+                    for name, task in self.tasks.items()}
+
+    def pending(self):
+        """
+        Names of the tasks still running.
+        """
+        return [name for name, task in self.status().items() if task["state"] == "running"]
+
+    def ready(self, *names):
+        """
+        True if the named tasks (all tasks if none are given) have finished.
+        """
+        status = self.status()
+        return all(status[name]["state"] != "running" for name in names or status)
+
+    def wait(self, *names, timeout=None):
+        """
+        Waits until the named tasks (all if none are given) have finished or
+        `timeout` seconds have passed. Returns True if they all finished.
+        """
+        with self.lock:
+            tasks = [self.tasks[name] for name in names or self.tasks]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for task in tasks:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not task["done"].wait(remaining):
+                return False
+        return True
+
+    def _run(self, task, func):
+        start = time.perf_counter()
+        try:
+            func()
+            state, error = "ready", None
+        except Exception as e:
+            # A failed warm-up only means the first real call pays (or raises) instead
+            state, error = "failed", f"{type(e).__name__}: {e}"
+        with self.lock:
+            task.update(state=state, error=error, seconds=time.perf_counter() - start)
+        task["done"].set()
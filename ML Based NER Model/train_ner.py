@@ -0,0 +1,220 @@
+# train_ner.py
+"""
+Trains the resume NER model on train_data.pkl with the spaCy v3 API.
+
+    python train_ner.py                   # convert (once) and train into nlp_model/
+    python train_ner.py --convert-only    # just write corpus/train.spacy and corpus/dev.spacy
+
+train_data.pkl holds (text, {"entities": [(start, end, label), ...]}) pairs.
+They are converted once into binary DocBin files; examples whose spans
+overlap or don't fall on token boundaries are repaired or reported there,
+not skipped silently at every training step.
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import hashlib
+import argparse
+from multiprocessing import Pool
+
+import spacy
+from spacy.tokens import DocBin, Span
+from spacy.training import Example
+from spacy.util import filter_spans, minibatch
+
+DATA_PATH = "train_data.pkl"
+CORPUS_DIR = "corpus"
+MODEL_DIR = "nlp_model"
+LANG = "en"
+
+_nlp = None
+
+def _init_worker(lang):
+    global _nlp
+    _nlp = spacy.blank(lang)
+
+def _trim(span):
+    """
+    Returns the span without leading or trailing whitespace tokens (which
+    the NER oracle cannot learn), or None if nothing is left.
+    """
+    start, end = span.start, span.end
+    while start < end and span.doc[start].is_space:
+        start += 1
+    while end > start and span.doc[end - 1].is_space:
+        end -= 1
+    if start == end:
+        return None
+    return Span(span.doc, start, end, label=span.label)
+
+def _convert_chunk(chunk):
+    """
+    Converts (text, annotations) pairs into a serialised DocBin. Returns
+    (bytes, dropped_spans, overlapping_spans).
+    """
+    doc_bin = DocBin(store_user_data=False)
+    dropped = overlapping = 0
+    for text, annotations in chunk:
+        doc = _nlp.make_doc(text)
+        spans = []
+        for start, end, label in annotations.get("entities", []):
+            # Resume annotations often include surrounding whitespace
+            span = doc.char_span(start, end, label=label, alignment_mode="contract")
+            span = _trim(span) if span is not None else None
+            if span is None:
+                dropped += 1
+            else:
+                spans.append(span)
+        filtered = filter_spans(spans)
+        overlapping += len(spans) - len(filtered)
+        doc.ents = filtered
+        doc_bin.add(doc)
+    return doc_bin.to_bytes(), dropped, overlapping
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def convert_training_data(data_path=DATA_PATH, corpus_dir=CORPUS_DIR, dev_fraction=0.2, seed=0,
+                          n_process=None, lang=LANG, force=False):
+    """
+    Splits the pickled training data into train/dev and writes both as
+    DocBin files in `corpus_dir`, preparing docs on `n_process` processes
+    (all CPUs by default). Nothing is redone if the corpus was already built
+    from the same data and split settings. Returns (train_path, dev_path).
+    """
+    train_path = os.path.join(corpus_dir, "train.spacy")
+    dev_path = os.path.join(corpus_dir, "dev.spacy")
+    meta_path = os.path.join(corpus_dir, "meta.json")
+    settings = {"source_hash": file_hash(data_path), "dev_fraction": dev_fraction, "seed": seed, "lang": lang}
+    if not force and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            if json.load(f).get("settings") == settings:
+                return train_path, dev_path
+
+    with open(data_path, "rb") as f:
+        data = pickle.load(f)
+    random.Random(seed).shuffle(data)
+    n_dev = max(1, int(len(data) * dev_fraction))
+    splits = {"dev": data[:n_dev], "train": data[n_dev:]}
+
+    n_process = n_process or os.cpu_count() or 1
+    os.makedirs(corpus_dir, exist_ok=True)
+    report = {}
+    with Pool(n_process, initializer=_init_worker, initargs=(lang,)) as pool:
+        for name, examples in splits.items():
+            chunk_size = max(1, len(examples) // (4 * n_process))
+            chunks = [examples[i:i + chunk_size] for i in range(0, len(examples), chunk_size)]
+            doc_bin = DocBin(store_user_data=False)
+            dropped = overlapping = 0
+            for data_bytes, chunk_dropped, chunk_overlapping in pool.imap(_convert_chunk, chunks):
+                doc_bin.merge(DocBin().from_bytes(data_bytes))
+                dropped += chunk_dropped
+                overlapping += chunk_overlapping
+            doc_bin.to_disk(os.path.join(corpus_dir, name + ".spacy"))
+            report[name] = {"docs": len(doc_bin), "misaligned_spans": dropped, "overlapping_spans": overlapping}
+            print(f"{name}: {len(doc_bin)} docs, {dropped} misaligned and {overlapping} overlapping spans dropped")
+
+    with open(meta_path, "w") as f:
+        json.dump({"settings": settings, "report": report}, f, indent=2)
+    return train_path, dev_path
+
+def load_examples(nlp, path):
+    """
+    Returns the Examples of a DocBin file, pairing a fresh tokenisation of
+    each text with its annotated Doc.
+    """
+    docs = DocBin().from_disk(path).get_docs(nlp.vocab)
+    return [Example(nlp.make_doc(doc.text), doc) for doc in docs]
+
+def compounding(start, stop, compound):
+    """
+    Yields batch sizes growing from `start` by a factor of `compound` per
+    batch, capped at `stop`.
+    """
+    size = start
+    while True:
+        yield min(size, stop)
+        size *= compound
+
+def train(train_path, dev_path, output_dir=MODEL_DIR, max_epochs=30, patience=3, dropout=0.2,
+          batch_start=4.0, batch_stop=32.0, batch_compound=1.001, seed=0, lang=LANG):
+    """
+    Trains a blank pipeline with an NER component on the train corpus with
+    compounding minibatches, evaluates on the dev corpus after every epoch
+    and saves the best model (by entity F-score) to `output_dir`. Stops
+    after `patience` epochs without improvement. Returns the per-epoch
+    history: loss, dev precision/recall/F, and words per second.
+    """
+    spacy.util.fix_random_seed(seed)
+    nlp = spacy.blank(lang)
+    nlp.add_pipe("ner")
+    train_examples = load_examples(nlp, train_path)
+    dev_examples = load_examples(nlp, dev_path)
+    # Labels are taken from the sample passed to initialize
+    optimizer = nlp.initialize(lambda: train_examples)
+
+    rng = random.Random(seed)
+    history, best_f, stale_epochs = [], -1.0, 0
+    for epoch in range(1, max_epochs + 1):
+        rng.shuffle(train_examples)
+        losses, words = {}, 0
+        start = time.perf_counter()
+        for batch in minibatch(train_examples, size=compounding(batch_start, batch_stop, batch_compound)):
+            nlp.update(batch, drop=dropout, sgd=optimizer, losses=losses)
+            words += sum(len(example.reference) for example in batch)
+        seconds = time.perf_counter() - start
+
+        scores = nlp.evaluate(dev_examples)
+        entry = {
+            "epoch": epoch,
+            "loss": float(losses.get("ner", 0.0)),
+            "ents_p": float(scores.get("ents_p") or 0.0),
+            "ents_r": float(scores.get("ents_r") or 0.0),
+            "ents_f": float(scores.get("ents_f") or 0.0),
+            "words_per_second": words / seconds if seconds else 0.0,
+            "seconds": seconds,
+        }
+        history.append(entry)
+        print("epoch {epoch:>3}  loss {loss:>10.2f}  P {ents_p:.3f}  R {ents_r:.3f}  F {ents_f:.3f}  "
+              "{words_per_second:>8.0f} words/s".format(**entry))
+
+        if entry["ents_f"] > best_f:
+            best_f, stale_epochs = entry["ents_f"], 0
+            nlp.to_disk(output_dir)
+        else:
+            stale_epochs += 1
+            if stale_epochs >= patience:
+                print(f"No improvement for {patience} epochs, stopping")
+                break
+
+    with open(os.path.join(output_dir, "training_history.json"), "w") as f:
+        json.dump(history, f, indent=2)
+    print(f"Best dev F {best_f:.3f}, model saved to {output_dir}")
+    return history
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the resume NER model")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--corpus", default=CORPUS_DIR)
+    parser.add_argument("--output", default=MODEL_DIR)
+    parser.add_argument("--dev-fraction", type=float, default=0.2)
+    parser.add_argument("--n-process", type=int, help="processes for data prep (default: all CPUs)")
+    parser.add_argument("--max-epochs", type=int, default=30)
+    parser.add_argument("--patience", type=int, default=3)
+    parser.add_argument("--dropout", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--convert-only", action="store_true")
+    parser.add_argument("--force-convert", action="store_true")
+    args = parser.parse_args(argv)
+
+    train_path, dev_path = convert_training_data(args.data, args.corpus, args.dev_fraction, args.seed,
+                                                 args.n_process, force=args.force_convert)
+    if not args.convert_only:
+        train(train_path, dev_path, args.output, args.max_epochs, args.patience, args.dropout, seed=args.seed)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])